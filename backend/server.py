@@ -5,6 +5,9 @@ from pydantic import BaseModel
 import json
 import os
 from gpt_researcher.utils.websocket_manager import WebSocketManager
+from gpt_researcher.utils.http import close_async_client
+from gpt_researcher.utils.process_pool import shutdown_process_pool
+from gpt_researcher.scraper.browser import close_browser_pools
 from .utils import write_md_to_pdf
 
 
@@ -31,6 +34,14 @@ def startup_event():
         os.makedirs("outputs")
     app.mount("/outputs", StaticFiles(directory="outputs"), name="outputs")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_async_client()
+    shutdown_process_pool()
+    close_browser_pools()
+
+
 @app.get("/")
 async def read_root(request: Request):
     return templates.TemplateResponse('index.html', {"request": request, "report": None})
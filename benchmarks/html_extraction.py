@@ -0,0 +1,78 @@
+"""
+Microbenchmark of the html text extraction: the BeautifulSoup path against the lxml extractor.
+
+Usage:
+    python benchmarks/html_extraction.py <corpus_dir> [--repeat 5] [--boilerplate]
+
+The corpus is a directory of saved pages (*.html, *.htm), searched recursively.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from gpt_researcher.scraper.extractor import clean_text, extract_text
+
+
+def extract_text_with_bs(html):
+    """The extraction of Scraper.parse_html before the lxml extractor"""
+    soup = BeautifulSoup(html, "lxml")
+    for script_or_style in soup(["script", "style"]):
+        script_or_style.extract()
+    text = ""
+    for element in soup.find_all(["p", "h1", "h2", "h3", "h4", "h5"]):
+        text += element.text + "\n"
+    return clean_text(text)
+
+
+def load_corpus(corpus_dir):
+    paths = sorted(p for p in Path(corpus_dir).rglob("*") if p.suffix.lower() in (".html", ".htm"))
+    return [(str(path), path.read_bytes()) for path in paths]
+
+
+def run(extract, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _, html in pages:
+            extract(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus_dir", help="directory of saved html pages")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed passes, the best one is reported")
+    parser.add_argument("--boilerplate", action="store_true", help="also time the extractor with boilerplate removal")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus_dir)
+    if not pages:
+        sys.exit(f"No html pages found in {args.corpus_dir}")
+    total_bytes = sum(len(html) for _, html in pages)
+    print(f"{len(pages)} pages, {total_bytes / 1024 / 1024:.1f} MB, best of {args.repeat} passes")
+
+    mismatches = [path for path, html in pages if extract_text(html) != extract_text_with_bs(html)]
+    print(f"Identical output on {len(pages) - len(mismatches)}/{len(pages)} pages")
+    for path in mismatches[:10]:
+        print(f"  differs: {path}")
+
+    candidates = [("beautifulsoup", extract_text_with_bs), ("lxml", extract_text)]
+    if args.boilerplate:
+        candidates.append(("lxml + boilerplate removal", lambda html: extract_text(html, remove_boilerplate=True)))
+    baseline = None
+    for name, extract in candidates:
+        elapsed = run(extract, pages, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:<28} {elapsed * 1000:9.1f} ms  {total_bytes / elapsed / 1024 / 1024:7.1f} MB/s  "
+              f"{baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,13 @@ class Config:
         """Initialize the config class."""
         self.config_file = config_file if config_file else os.getenv('CONFIG_FILE')
         self.retriever = os.getenv('SEARCH_RETRIEVER', "tavily")
+        self.retriever_hedge_delay = float(os.getenv('RETRIEVER_HEDGE_DELAY', 0.0))
+        self.search_cache = os.getenv('SEARCH_CACHE', "True").lower() == "true"
+        self.search_cache_persist = os.getenv('SEARCH_CACHE_PERSIST', "False").lower() == "true"
+        self.search_cache_ttl = int(os.getenv('SEARCH_CACHE_TTL', 6 * 60 * 60))
+        self.search_cache_ttls = json.loads(os.getenv('SEARCH_CACHE_TTLS', "{}"))
+        self.search_cache_size = int(os.getenv('SEARCH_CACHE_SIZE', 1000))
+        self.search_cache_max_bytes = int(os.getenv('SEARCH_CACHE_MAX_BYTES', 64 * 1024 * 1024))
         self.embedding_provider = os.getenv('EMBEDDING_PROVIDER', 'openai')
         self.llm_provider = os.getenv('LLM_PROVIDER', "ChatOpenAI")
         self.fast_llm_model = os.getenv('FAST_LLM_MODEL', "gpt-3.5-turbo-16k")
@@ -17,7 +24,13 @@ class Config:
         self.fast_token_limit = int(os.getenv('FAST_TOKEN_LIMIT', 2000))
         self.smart_token_limit = int(os.getenv('SMART_TOKEN_LIMIT', 4000))
         self.browse_chunk_max_length = int(os.getenv('BROWSE_CHUNK_MAX_LENGTH', 8192))
+        self.context_window_share = float(os.getenv('CONTEXT_WINDOW_SHARE', 0.75))
+        self.model_context_windows = json.loads(os.getenv('MODEL_CONTEXT_WINDOWS', "{}"))
+        self.index_chunk_tokens = int(os.getenv('INDEX_CHUNK_TOKENS', 250))
+        self.index_chunk_overlap_tokens = int(os.getenv('INDEX_CHUNK_OVERLAP_TOKENS', 25))
         self.summary_token_limit = int(os.getenv('SUMMARY_TOKEN_LIMIT', 700))
+        self.summary_chunk_tokens = int(os.getenv('SUMMARY_CHUNK_TOKENS', 0))
+        self.summary_max_concurrency = int(os.getenv('SUMMARY_MAX_CONCURRENCY', 8))
         self.temperature = float(os.getenv('TEMPERATURE', 0.55))
         self.user_agent = os.getenv('USER_AGENT', "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                                                    "(KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0")
@@ -26,6 +39,58 @@ class Config:
         self.total_words = int(os.getenv('TOTAL_WORDS', 1000))
         self.report_format = os.getenv('REPORT_FORMAT', "APA")
         self.max_iterations = int(os.getenv('MAX_ITERATIONS', 3))
+        self.max_concurrent_sub_queries = int(os.getenv('MAX_CONCURRENT_SUB_QUERIES', 4))
+        self.pipeline_fetch_workers = int(os.getenv('PIPELINE_FETCH_WORKERS', 20))
+        self.pipeline_extract_workers = int(os.getenv('PIPELINE_EXTRACT_WORKERS', os.cpu_count() or 4))
+        self.pipeline_embed_workers = int(os.getenv('PIPELINE_EMBED_WORKERS', 4))
+        self.pipeline_rank_workers = int(os.getenv('PIPELINE_RANK_WORKERS', 4))
+        self.pipeline_queue_size = int(os.getenv('PIPELINE_QUEUE_SIZE', 100))
+        self.http_max_connections = int(os.getenv('HTTP_MAX_CONNECTIONS', 100))
+        self.http_max_keepalive_connections = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', 20))
+        self.http_timeout = float(os.getenv('HTTP_TIMEOUT', 10))
+        self.scraper = os.getenv('SCRAPER', "static,selenium")
+        self.scraper_render_min_chars = int(os.getenv('SCRAPER_RENDER_MIN_CHARS', 300))
+        self.scraper_timeout = float(os.getenv('SCRAPER_TIMEOUT', 4))
+        self.scraper_max_concurrency = int(os.getenv('SCRAPER_MAX_CONCURRENCY', 20))
+        self.scraper_max_per_host = int(os.getenv('SCRAPER_MAX_PER_HOST', 4))
+        self.scraper_max_body_bytes = int(os.getenv('SCRAPER_MAX_BODY_BYTES', 5 * 1024 * 1024))
+        self.scraper_max_pdf_bytes = int(os.getenv('SCRAPER_MAX_PDF_BYTES', 50 * 1024 * 1024))
+        self.scraper_pdf_max_pages = int(os.getenv('SCRAPER_PDF_MAX_PAGES', 100))
+        self.scraper_pdf_max_chars = int(os.getenv('SCRAPER_PDF_MAX_CHARS', 200000))
+        self.scraper_remove_boilerplate = os.getenv('SCRAPER_REMOVE_BOILERPLATE', "False").lower() == "true"
+        # Processes that parse html, 0 parses in a thread. The workers import the main module again, so a
+        # script that sets this must start the research under `if __name__ == "__main__":`
+        self.scraper_parse_workers = int(os.getenv('SCRAPER_PARSE_WORKERS', 0))
+        self.selenium_web_browser = os.getenv('SELENIUM_WEB_BROWSER', "chrome")
+        self.browser_max_drivers = int(os.getenv('BROWSER_MAX_DRIVERS', 4))
+        self.browser_max_pages_per_driver = int(os.getenv('BROWSER_MAX_PAGES_PER_DRIVER', 50))
+        self.browser_idle_timeout = float(os.getenv('BROWSER_IDLE_TIMEOUT', 300))
+        self.browser_page_load_timeout = float(os.getenv('BROWSER_PAGE_LOAD_TIMEOUT', 15))
+        self.cache_dir = os.getenv('CACHE_DIR', os.path.join(os.path.expanduser("~"), ".cache", "gpt-researcher"))
+        self.scrape_cache = os.getenv('SCRAPE_CACHE', "False").lower() == "true"
+        self.scrape_cache_ttl = int(os.getenv('SCRAPE_CACHE_TTL', 24 * 60 * 60))
+        self.scrape_cache_max_bytes = int(os.getenv('SCRAPE_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+        self.arxiv_cache = os.getenv('ARXIV_CACHE', "True").lower() == "true"
+        self.arxiv_cache_max_bytes = int(os.getenv('ARXIV_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+        self.arxiv_batch_size = int(os.getenv('ARXIV_BATCH_SIZE', 20))
+        self.arxiv_batch_delay = float(os.getenv('ARXIV_BATCH_DELAY', 0.1))
+        self.near_duplicate_max_distance = int(os.getenv('NEAR_DUPLICATE_MAX_DISTANCE', 3))
+        self.embedding_cache_size = int(os.getenv('EMBEDDING_CACHE_SIZE', 10000))
+        self.embedding_cache = os.getenv('EMBEDDING_CACHE', "False").lower() == "true"
+        self.embedding_cache_max_bytes = int(os.getenv('EMBEDDING_CACHE_MAX_BYTES', 1024 * 1024 * 1024))
+        self.embedding_batch_size = int(os.getenv('EMBEDDING_BATCH_SIZE', 100))
+        self.embedding_max_concurrency = int(os.getenv('EMBEDDING_MAX_CONCURRENCY', 4))
+        self.embedding_requests_per_minute = int(os.getenv('EMBEDDING_REQUESTS_PER_MINUTE', 3000))
+        self.embedding_tokens_per_minute = int(os.getenv('EMBEDDING_TOKENS_PER_MINUTE', 1000000))
+        self.llm_requests_per_minute = int(os.getenv('LLM_REQUESTS_PER_MINUTE', 500))
+        self.llm_tokens_per_minute = int(os.getenv('LLM_TOKENS_PER_MINUTE', 150000))
+        self.llm_rate_limits = json.loads(os.getenv('LLM_RATE_LIMITS', "{}"))
+        self.llm_max_retries = int(os.getenv('LLM_MAX_RETRIES', 6))
+        self.llm_retry_base_delay = float(os.getenv('LLM_RETRY_BASE_DELAY', 1))
+        self.llm_retry_max_delay = float(os.getenv('LLM_RETRY_MAX_DELAY', 60))
+        self.llm_cache = os.getenv('LLM_CACHE', "False").lower() == "true"
+        self.llm_cache_ttl = int(os.getenv('LLM_CACHE_TTL', 7 * 24 * 60 * 60))
+        self.llm_cache_max_bytes = int(os.getenv('LLM_CACHE_MAX_BYTES', 256 * 1024 * 1024))
         self.agent_role = os.getenv('AGENT_ROLE', None)
 
         self.load_config_file()
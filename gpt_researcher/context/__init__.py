@@ -1,4 +1,6 @@
 from .compression import ContextCompressor
 from .retriever import SearchAPIRetriever
+from .index import ContextIndex
+from .dedup import NearDuplicateFilter
 
-__all__ = ['ContextCompressor', 'SearchAPIRetriever']
+__all__ = ['ContextCompressor', 'SearchAPIRetriever', 'ContextIndex', 'NearDuplicateFilter']
@@ -8,16 +8,22 @@ from langchain.retrievers.document_compressors import (
 )
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
+from gpt_researcher.config import Config
+from gpt_researcher.utils.tokens import count_tokens
+
 
 class ContextCompressor:
-    def __init__(self, documents, embeddings, max_results=5, **kwargs):
+    def __init__(self, documents, embeddings, max_results=5, cfg=None, **kwargs):
         self.max_results = max_results
         self.documents = documents
         self.kwargs = kwargs
         self.embeddings = embeddings
+        self.cfg = cfg if cfg else Config()
 
     def _get_contextual_retriever(self):
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+        splitter = RecursiveCharacterTextSplitter(chunk_size=self.cfg.index_chunk_tokens,
+                                                  chunk_overlap=self.cfg.index_chunk_overlap_tokens,
+                                                  length_function=count_tokens)
         relevance_filter = EmbeddingsFilter(embeddings=self.embeddings, similarity_threshold=0.78)
         pipeline_compressor = DocumentCompressorPipeline(
             transformers=[splitter, relevance_filter]
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import re
+
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def simhash(text, shingle_size=3):
+    """
+    Computes the 64 bit SimHash of a text from its word shingles.
+    Texts that share most of their shingles get fingerprints a few bits apart.
+    Args:
+        text: the text
+        shingle_size: number of words per shingle
+
+    Returns:
+        int: the fingerprint
+    """
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return 0
+    shingles = {" ".join(words[i:i + shingle_size]) for i in range(max(1, len(words) - shingle_size + 1))}
+    hashes = np.frombuffer(b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+                                    for shingle in shingles), dtype=np.uint8)
+    # One row of 64 bits per shingle, a fingerprint bit is set when most shingles have it set
+    bits = np.unpackbits(hashes).reshape(-1, 64)
+    fingerprint = np.packbits(bits.sum(axis=0) * 2 > len(shingles))
+    return int.from_bytes(fingerprint.tobytes(), "big")
+
+
+class NearDuplicateFilter:
+    """
+    Drops pages whose content is a near duplicate of a page seen before in the same run,
+    e.g. syndicated copies of an article or the same page under another url.
+    """
+    def __init__(self, max_distance=3):
+        """
+        Args:
+            max_distance: maximum number of differing SimHash bits of near duplicates
+        """
+        self.max_distance = max_distance
+        self.fingerprints = []
+
+    def add(self, fingerprint):
+        """
+        Remembers a fingerprint unless it is a near duplicate of one seen before
+        Returns:
+            bool: True if the fingerprint is new
+        """
+        if any((fingerprint ^ seen).bit_count() <= self.max_distance for seen in self.fingerprints):
+            return False
+        self.fingerprints.append(fingerprint)
+        return True
+
+    async def filter_pages(self, pages):
+        """
+        Filters out the near duplicate pages
+        Args:
+            pages: list of dicts with 'url' and 'raw_content'
+
+        Returns:
+            the pages that are not near duplicates of earlier pages
+        """
+        fingerprints = await asyncio.to_thread(lambda: [simhash(page.get("raw_content", "")) for page in pages])
+        # Checking and adding happens without awaiting, so concurrent sub-queries see each other's pages
+        return [page for page, fingerprint in zip(pages, fingerprints) if self.add(fingerprint)]
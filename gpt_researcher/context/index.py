@@ -0,0 +1,94 @@
+import asyncio
+
+import numpy as np
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.vectorstores import FAISS
+from langchain.vectorstores.utils import DistanceStrategy
+
+from gpt_researcher.utils.tokens import count_tokens
+
+
+class ContextIndex:
+    """
+    Incremental vector index of the chunks scraped during one research run.
+    Pages are split and embedded once, when they are added, and every query is a top-k lookup.
+    """
+    def __init__(self, embeddings, chunk_size=250, chunk_overlap=25, similarity_threshold=0.78):
+        """
+        Initializes the index
+        Args:
+            embeddings: LangChain embeddings used for the chunks and the queries
+            chunk_size: chunk size of the text splitter in tokens
+            chunk_overlap: chunk overlap of the text splitter in tokens
+            similarity_threshold: minimum cosine similarity of a relevant chunk
+        """
+        self.embeddings = embeddings
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                                       length_function=count_tokens)
+        self.similarity_threshold = similarity_threshold
+        self.vectorstore = None
+
+    @staticmethod
+    def _normalize(vectors):
+        # With unit vectors the inner product of the FAISS index is the cosine similarity
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    async def add_pages(self, pages):
+        """
+        Splits, embeds and indexes the given pages
+        Args:
+            pages: list of dicts with 'url', 'raw_content' and optionally 'title'
+        """
+        documents = [
+            Document(
+                page_content=page.get("raw_content", ""),
+                metadata={
+                    "title": page.get("title", ""),
+                    "source": page.get("url", ""),
+                },
+            )
+            for page in pages
+        ]
+        chunks = await asyncio.to_thread(self.splitter.split_documents, documents)
+        if not chunks:
+            return
+        texts = [chunk.page_content for chunk in chunks]
+        vectors = await self.embeddings.aembed_documents(texts)
+        text_embeddings = list(zip(texts, self._normalize(vectors).tolist()))
+        metadatas = [chunk.metadata for chunk in chunks]
+        # No await between the check and the assignment, so concurrent callers can't both create the store
+        if self.vectorstore is None:
+            self.vectorstore = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas=metadatas,
+                                                     distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT)
+        else:
+            self.vectorstore.add_embeddings(text_embeddings, metadatas=metadatas)
+
+    async def get_relevant_documents(self, query, max_results=5):
+        """
+        Looks up the chunks most similar to the query
+        Args:
+            query: the query
+            max_results: maximum number of chunks to return
+
+        Returns:
+            list of Documents, most similar first
+        """
+        if self.vectorstore is None:
+            return []
+        vector = await self.embeddings.aembed_query(query)
+        docs_and_scores = self.vectorstore.similarity_search_with_score_by_vector(
+            self._normalize(vector).tolist(), k=max_results)
+        return [doc for doc, score in docs_and_scores if score >= self.similarity_threshold]
+
+    async def get_context(self, query, max_results=5):
+        """
+        Gets the relevant chunks for the query, formatted as context for the report
+        """
+        docs = await self.get_relevant_documents(query, max_results)
+        return f"\n".join(f"Source: {d.metadata.get('source')}\n"
+                          f"Title: {d.metadata.get('title')}\n"
+                          f"Content: {d.page_content}\n"
+                          for d in docs)
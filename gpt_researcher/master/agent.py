@@ -1,7 +1,10 @@
-import time
+import asyncio
 from gpt_researcher.config import Config
 from gpt_researcher.master.functions import *
-from gpt_researcher.context.compression import ContextCompressor
+from gpt_researcher.master.pipeline import ResearchPipeline
+from gpt_researcher.context.index import ContextIndex
+from gpt_researcher.context.dedup import NearDuplicateFilter
+from gpt_researcher.utils.url import normalize_url
 from gpt_researcher.memory import Memory
 
 
@@ -24,11 +27,25 @@ class GPTResearcher:
         self.report_type = report_type
         self.websocket = websocket
         self.cfg = Config(config_path)
-        self.retriever = get_retriever(self.cfg.retriever)
+        self.retriever = get_retriever(self.cfg.retriever, self.cfg)
         self.context = []
         self.source_urls = source_urls
-        self.memory = Memory(self.cfg.embedding_provider)
+        self.memory = Memory(self.cfg.embedding_provider,
+                             cache_size=self.cfg.embedding_cache_size,
+                             cache_dir=self.cfg.cache_dir if self.cfg.embedding_cache else None,
+                             cache_max_bytes=self.cfg.embedding_cache_max_bytes,
+                             batch_size=self.cfg.embedding_batch_size,
+                             max_concurrency=self.cfg.embedding_max_concurrency,
+                             requests_per_minute=self.cfg.embedding_requests_per_minute,
+                             tokens_per_minute=self.cfg.embedding_tokens_per_minute)
+        # One chunk index per run: pages are embedded once and every sub-query is a lookup
+        self.context_index = ContextIndex(self.memory.get_embeddings(),
+                                          chunk_size=self.cfg.index_chunk_tokens,
+                                          chunk_overlap=self.cfg.index_chunk_overlap_tokens)
+        self.page_filter = NearDuplicateFilter(max_distance=self.cfg.near_duplicate_max_distance)
         self.visited_urls = set()
+        # Normalized form of the visited urls, so variants of a visited url are skipped too
+        self.visited_url_keys = set()
 
     async def run(self):
         """
@@ -54,7 +71,7 @@ class GPTResearcher:
         report = await generate_report(query=self.query, context=self.context,
                                        agent_role_prompt=self.role, report_type=self.report_type,
                                        websocket=self.websocket, cfg=self.cfg)
-        time.sleep(2)
+        await asyncio.sleep(2)
         return report
 
     async def get_context_by_urls(self, urls):
@@ -65,8 +82,8 @@ class GPTResearcher:
         await stream_output("logs",
                             f"🧠 I will conduct my research based on the following urls: {new_search_urls}...",
                             self.websocket)
-        scraped_sites = scrape_urls(new_search_urls, self.cfg)
-        return await self.get_similar_content_by_query(self.query, scraped_sites)
+        contexts = await ResearchPipeline(self).run([self.query], urls=new_search_urls)
+        return contexts[0]
 
     async def get_context_by_search(self, query):
         """
@@ -74,63 +91,61 @@ class GPTResearcher:
         Returns:
             context: List of context
         """
-        context = []
         # Generate Sub-Queries including original query
         sub_queries = await get_sub_queries(query, self.role, self.cfg) + [query]
         await stream_output("logs",
                             f"🧠 I will conduct my research based on the following queries: {sub_queries}...",
                             self.websocket)
 
-        # Run Sub-Queries
-        for sub_query in sub_queries:
-            await stream_output("logs", f"\n🔎 Running research for '{sub_query}'...", self.websocket)
-            scraped_sites = await self.scrape_sites_by_query(sub_query)
-            content = await self.get_similar_content_by_query(sub_query, scraped_sites)
-            await stream_output("logs", f"📃 {content}", self.websocket)
-            context.append(content)
+        # Sub-queries flow through the search, fetch, extract, embed and rank stages concurrently.
+        # The context comes back in sub-query order.
+        return await ResearchPipeline(self).run(sub_queries)
 
-        return context
-
-    async def get_new_urls(self, url_set_input):
+    async def get_new_urls(self, url_set_input, websocket=None):
         """ Gets the new urls from the given url set.
         Args: url_set_input (set[str]): The url set to get the new urls from
+              websocket: where to stream the logs to, defaults to the researcher's websocket
         Returns: list[str]: The new urls from the given url set
         """
 
         new_urls = []
         for url in url_set_input:
-            if url not in self.visited_urls:
-                await stream_output("logs", f"✅ Adding source url to research: {url}\n", self.websocket)
-
+            if not url:
+                continue
+            url_key = normalize_url(url)
+            if url_key not in self.visited_url_keys:
+                # Mark as visited before yielding to the event loop so concurrent sub-queries don't pick it up too
+                self.visited_url_keys.add(url_key)
                 self.visited_urls.add(url)
                 new_urls.append(url)
+                await stream_output("logs", f"✅ Adding source url to research: {url}\n", websocket or self.websocket)
 
         return new_urls
 
-    async def scrape_sites_by_query(self, sub_query):
+    async def search_new_urls_by_query(self, sub_query, websocket=None):
         """
-        Runs a sub-query
+        Searches a sub-query
         Args:
             sub_query:
+            websocket: where to stream the logs to, defaults to the researcher's websocket
 
         Returns:
-            Summary
+            list[str]: The urls found that haven't been visited yet
         """
-        # Get Urls
         retriever = self.retriever(sub_query)
-        search_results = retriever.search(max_results=self.cfg.max_search_results_per_query)
-        new_search_urls = await self.get_new_urls([url.get("href") for url in search_results])
-
-        # Scrape Urls
-        # await stream_output("logs", f"📝Scraping urls {new_search_urls}...\n", self.websocket)
-        await stream_output("logs", f"🤔Researching for relevant information...\n", self.websocket)
-        scraped_content_results = scrape_urls(new_search_urls, self.cfg)
-        return scraped_content_results
-
-    async def get_similar_content_by_query(self, query, pages):
-        await stream_output("logs", f"📃 Getting relevant content based on query: {query}...", self.websocket)
-        # Summarize Raw Data
-        context_compressor = ContextCompressor(documents=pages, embeddings=self.memory.get_embeddings())
-        # Run Tasks
-        return context_compressor.get_context(query, max_results=8)
+        search_results = await retriever.asearch(max_results=self.cfg.max_search_results_per_query)
+        return await self.get_new_urls([url.get("href") for url in search_results], websocket)
 
+    async def index_pages(self, pages):
+        """
+        Drops copies of pages already indexed and adds the new pages to the run's chunk index
+        """
+        pages = await self.page_filter.filter_pages(pages)
+        await self.context_index.add_pages(pages)
+
+    async def get_similar_content_by_query(self, query, pages, websocket=None):
+        await stream_output("logs", f"📃 Getting relevant content based on query: {query}...",
+                            websocket or self.websocket)
+        # Index the new pages, then look up the relevant chunks
+        await self.index_pages(pages)
+        return await self.context_index.get_context(query, max_results=8)
@@ -1,20 +1,31 @@
 import asyncio
+from functools import partial
 from gpt_researcher.utils.llm import *
 from gpt_researcher.scraper import Scraper
 from gpt_researcher.master.prompts import *
+from gpt_researcher.utils.tokens import (count_message_tokens, get_token_budget, pack_by_tokens, split_by_tokens,
+                                         truncate_tokens)
 import json
 
 
-def get_retriever(retriever):
+def get_retriever(retriever, cfg=None):
     """
     Gets the retriever
     Args:
-        retriever: retriever name
+        retriever: retriever name, or a comma separated list of names to query several retrievers in parallel
+        cfg: Config (optional)
 
     Returns:
         retriever: Retriever class
 
     """
+    if "," in retriever:
+        from gpt_researcher.retrievers import MultiRetriever
+        retrievers = [get_retriever(name.strip(), cfg) for name in retriever.split(",") if name.strip()]
+        hedge_delay = cfg.retriever_hedge_delay if cfg else 0.0
+        return partial(MultiRetriever, retrievers=retrievers, hedge_delay=hedge_delay)
+
+    name = retriever
     match retriever:
         case "tavily":
             from gpt_researcher.retrievers import TavilySearch
@@ -45,6 +56,11 @@ def get_retriever(retriever):
         case _:
             raise Exception("Retriever not found.")
 
+    from gpt_researcher.retrievers.cache import CachedRetriever, get_search_cache
+    search_cache = get_search_cache(cfg) if cfg else None
+    if search_cache:
+        retriever = partial(CachedRetriever, retriever=retriever, name=name, cache=search_cache)
+
     return retriever
 
 
@@ -66,7 +82,8 @@ async def choose_agent(query, cfg):
                 {"role": "system", "content": f"{auto_agent_instructions()}"},
                 {"role": "user", "content": f"task: {query}"}],
             temperature=0,
-            llm_provider=cfg.llm_provider
+            llm_provider=cfg.llm_provider,
+            cfg=cfg
         )
         agent_dict = json.loads(response)
         return agent_dict["server"], agent_dict["agent_role_prompt"]
@@ -93,7 +110,8 @@ async def get_sub_queries(query, agent_role_prompt, cfg):
                 {"role": "system", "content": f"{agent_role_prompt}"},
                 {"role": "user", "content": generate_search_queries_prompt(query, max_iterations=cfg.max_iterations)}],
             temperature=0,
-            llm_provider=cfg.llm_provider
+            llm_provider=cfg.llm_provider,
+            cfg=cfg
         )
         try:
             sub_queries = json.loads(response)
@@ -110,9 +128,9 @@ async def get_sub_queries(query, agent_role_prompt, cfg):
     return sub_queries
 
 
-def scrape_urls(urls, cfg=None):
+async def scrape_urls(urls, cfg=None):
     """
-    Scrapes the urls
+    Scrapes the urls concurrently without blocking the event loop
     Args:
         urls: List of urls
         cfg: Config (optional)
@@ -124,7 +142,7 @@ def scrape_urls(urls, cfg=None):
     content = []
     user_agent = cfg.user_agent if cfg else "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0"
     try:
-        content = Scraper(urls, user_agent).run()
+        content = await Scraper(urls, user_agent, cfg).run()
     except Exception as e:
         print(f"{Fore.RED}Error in scrape_urls: {e}{Style.RESET_ALL}")
     return content
@@ -133,6 +151,8 @@ def scrape_urls(urls, cfg=None):
 async def summarize(query, content, agent_role_prompt, cfg, websocket=None):
     """
     Asynchronously summarizes a list of URLs.
+    The chunks of every URL go through one pool of cfg.summary_max_concurrency requests,
+    so all the sources are summarized at the same time.
 
     Args:
         query (str): The search query.
@@ -141,41 +161,34 @@ async def summarize(query, content, agent_role_prompt, cfg, websocket=None):
         cfg (object): Configuration object.
 
     Returns:
-        list: A list of dictionaries with 'url' and 'summary'.
+        list: A list of dictionaries with 'url' and 'summary', in the order of content.
     """
+    semaphore = asyncio.Semaphore(cfg.summary_max_concurrency)
+    # Chunks fill the fast model's window, next to the instructions and the summary
+    instructions = [{"role": "system", "content": f"{agent_role_prompt}"},
+                    {"role": "user", "content": generate_summary_prompt(query, "")}]
+    chunk_tokens = cfg.summary_chunk_tokens or get_token_budget(
+        cfg.fast_llm_model, cfg.context_window_share,
+        reserved=count_message_tokens(instructions, cfg.fast_llm_model),
+        completion_tokens=cfg.summary_token_limit, context_windows=cfg.model_context_windows)
 
     # Function to handle each summarization task for a chunk
     async def handle_task(url, chunk):
-        summary = await summarize_url(query, chunk, agent_role_prompt, cfg)
+        async with semaphore:
+            summary = await summarize_url(query, chunk, agent_role_prompt, cfg)
         if summary:
             await stream_output("logs", f"🌐 Summarizing url: {url}", websocket)
             await stream_output("logs", f"📃 {summary}", websocket)
-        return url, summary
-
-    # Function to split raw content into chunks of 10,000 words
-    def chunk_content(raw_content, chunk_size=10000):
-        words = raw_content.split()
-        for i in range(0, len(words), chunk_size):
-            yield ' '.join(words[i:i+chunk_size])
+        return summary
 
-    # Process each item one by one, but process chunks in parallel
-    concatenated_summaries = []
-    for item in content:
+    # Function to summarize the chunks of one URL in parallel and concatenate their summaries
+    async def handle_item(item):
         url = item['url']
-        raw_content = item['raw_content']
+        chunks = split_by_tokens(item['raw_content'], chunk_tokens, cfg.fast_llm_model)
+        summaries = await asyncio.gather(*[handle_task(url, chunk) for chunk in chunks])
+        return {'url': url, 'summary': ' '.join(summary for summary in summaries if summary)}
 
-        # Create tasks for all chunks of the current URL
-        chunk_tasks = [handle_task(url, chunk) for chunk in chunk_content(raw_content)]
-
-        # Run chunk tasks concurrently
-        chunk_summaries = await asyncio.gather(*chunk_tasks)
-
-        # Aggregate and concatenate summaries for the current URL
-        summaries = [summary for _, summary in chunk_summaries if summary]
-        concatenated_summary = ' '.join(summaries)
-        concatenated_summaries.append({'url': url, 'summary': concatenated_summary})
-
-    return concatenated_summaries
+    return list(await asyncio.gather(*[handle_item(item) for item in content]))
 
 
 async def summarize_url(query, raw_data, agent_role_prompt, cfg):
@@ -199,7 +212,8 @@ async def summarize_url(query, raw_data, agent_role_prompt, cfg):
                 {"role": "system", "content": f"{agent_role_prompt}"},
                 {"role": "user", "content": f"{generate_summary_prompt(query, raw_data)}"}],
             temperature=0,
-            llm_provider=cfg.llm_provider
+            llm_provider=cfg.llm_provider,
+            cfg=cfg
         )
     except Exception as e:
         print(f"{Fore.RED}Error in summarize: {e}{Style.RESET_ALL}")
@@ -225,6 +239,7 @@ async def generate_report(query, context, agent_role_prompt, report_type, websoc
     generate_prompt = get_report_by_type(report_type)
     report = ""
     try:
+        context = pack_report_context(query, context, agent_role_prompt, generate_prompt, cfg)
         report = await create_chat_completion(
             model=cfg.smart_llm_model,
             messages=[
@@ -234,7 +249,8 @@ async def generate_report(query, context, agent_role_prompt, report_type, websoc
             llm_provider=cfg.llm_provider,
             stream=True,
             websocket=websocket,
-            max_tokens=cfg.smart_token_limit
+            max_tokens=cfg.smart_token_limit,
+            cfg=cfg
         )
     except Exception as e:
         print(f"{Fore.RED}Error in generate_report: {e}{Style.RESET_ALL}")
@@ -242,6 +258,32 @@ async def generate_report(query, context, agent_role_prompt, report_type, websoc
     return report
 
 
+def pack_report_context(query, context, agent_role_prompt, generate_prompt, cfg):
+    """
+    Cuts the context down to what fits in the report prompt of the smart model, next to the instructions
+    and the report itself. Every sub-query keeps an equal share of the room.
+    Args:
+        query: the research query
+        context: list of context strings, one per sub-query, or a single string
+        agent_role_prompt: the system prompt
+        generate_prompt: the report prompt function
+        cfg: Config
+
+    Returns:
+        the context, cut down where needed
+    """
+    model = cfg.smart_llm_model
+    instructions = [{"role": "system", "content": f"{agent_role_prompt}"},
+                    {"role": "user", "content": generate_prompt(query, "", cfg.report_format, cfg.total_words)}]
+    max_tokens = get_token_budget(model, cfg.context_window_share,
+                                  reserved=count_message_tokens(instructions, model),
+                                  completion_tokens=cfg.smart_token_limit,
+                                  context_windows=cfg.model_context_windows)
+    if isinstance(context, str):
+        return truncate_tokens(context, max_tokens, model)
+    return pack_by_tokens(context, max_tokens, model)
+
+
 async def stream_output(type, output, websocket=None, logging=True):
     """
     Streams output to the websocket
@@ -257,3 +299,33 @@ async def stream_output(type, output, websocket=None, logging=True):
 
     if websocket:
         await websocket.send_json({"type": type, "output": output})
+
+
+class OutputBuffer:
+    """
+    Collects websocket messages so they can be sent later as one uninterrupted group.
+    Used to keep the logs of concurrently running sub-queries from interleaving.
+    """
+    def __init__(self, websocket=None):
+        """
+        Args:
+            websocket: websocket the buffered messages are eventually sent to
+        """
+        self.websocket = websocket
+        self.messages = []
+
+    async def send_json(self, data):
+        self.messages.append(data)
+
+    async def flush(self, lock=None):
+        """
+        Sends all buffered messages to the websocket
+        Args:
+            lock: optional asyncio.Lock shared by buffers that flush to the same websocket
+        """
+        messages, self.messages = self.messages, []
+        if not self.websocket:
+            return
+        async with lock or asyncio.Lock():
+            for message in messages:
+                await self.websocket.send_json(message)
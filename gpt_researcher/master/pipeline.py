@@ -0,0 +1,208 @@
+import asyncio
+
+from colorama import Fore, Style
+
+from gpt_researcher.master.functions import OutputBuffer, stream_output
+from gpt_researcher.scraper import Scraper
+from gpt_researcher.utils.http import get_async_client, get_scraper_limiter
+
+
+class Stage:
+    """
+    A pipeline stage: a bounded queue drained by a pool of workers.
+    A full queue blocks the stage feeding it, so a slow stage holds back the ones before it
+    instead of piling up pages in memory.
+    """
+    def __init__(self, name, handler, workers=1, queue_size=0, on_error=None, on_discard=None):
+        """
+        Args:
+            name: name of the stage, used in the logs
+            handler: async function processing one item, it hands its results to the next stage itself
+            workers: number of items processed at a time
+            queue_size: maximum number of items waiting in the queue, 0 for no limit
+            on_error: async function called with the item and the exception when the handler fails
+            on_discard: function called with every item still in the queue when the stage stops,
+                to release what the item holds
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue = asyncio.Queue(maxsize=max(0, queue_size))
+        self.on_error = on_error
+        self.on_discard = on_discard
+        self._tasks = []
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            self.queue.task_done()
+            if self.on_discard:
+                self.on_discard(item)
+
+    async def put(self, item):
+        await self.queue.put(item)
+
+    async def _work(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                await self.handler(item)
+            except Exception as e:
+                print(f"{Fore.RED}Error in {self.name} stage: {e}{Style.RESET_ALL}")
+                if self.on_error:
+                    await self.on_error(item, e)
+            finally:
+                self.queue.task_done()
+
+
+class SubQuery:
+    """
+    Progress of one sub-query through the pipeline
+    """
+    def __init__(self, query, websocket=None, urls=None):
+        self.query = query
+        # Pages to research instead of the search results of the query
+        self.urls = urls
+        # Logs are buffered and flushed together so concurrent sub-queries don't interleave
+        self.output = OutputBuffer(websocket)
+        self.pending_pages = 0
+        self.searched = False
+        self.ranked = False
+        self.context = asyncio.get_running_loop().create_future()
+
+
+class ResearchPipeline:
+    """
+    Gathers the context of the sub-queries through the stages
+    search -> fetch -> extract -> embed -> rank.
+    Every stage has its own worker pool, so downloads, parsing and embedding of different sub-queries
+    overlap instead of running one sub-query step after step. The lookups of the rank stage wait until
+    every page of the run is indexed.
+    """
+    def __init__(self, researcher):
+        """
+        Args:
+            researcher: the GPTResearcher the context is gathered for
+        """
+        self.researcher = researcher
+        self.cfg = researcher.cfg
+        self.scraper = Scraper([], self.cfg.user_agent, self.cfg)
+        self.flush_lock = asyncio.Lock()
+        queue_size = self.cfg.pipeline_queue_size
+        self.search_stage = Stage("search", self.search, self.cfg.max_concurrent_sub_queries,
+                                  on_error=self.search_failed)
+        self.fetch_stage = Stage("fetch", self.fetch, self.cfg.pipeline_fetch_workers, queue_size,
+                                 on_error=self.page_failed)
+        self.extract_stage = Stage("extract", self.extract, self.cfg.pipeline_extract_workers, queue_size,
+                                   on_error=self.page_failed, on_discard=self.discard_fetched)
+        self.embed_stage = Stage("embed", self.embed, self.cfg.pipeline_embed_workers, queue_size,
+                                 on_error=self.page_failed)
+        self.rank_stage = Stage("rank", self.rank, self.cfg.pipeline_rank_workers,
+                                on_error=self.rank_failed)
+        self.stages = [self.search_stage, self.fetch_stage, self.extract_stage, self.embed_stage, self.rank_stage]
+
+    async def run(self, sub_queries, urls=None):
+        """
+        Runs the sub-queries through the pipeline
+        Args:
+            sub_queries: list of queries
+            urls: pages to research for every sub-query instead of searching it, None to search
+
+        Returns:
+            list of contexts, in sub-query order
+        """
+        self.client = get_async_client(self.cfg)
+        self.limiter = get_scraper_limiter(self.cfg)
+        items = [SubQuery(sub_query, self.researcher.websocket, urls) for sub_query in sub_queries]
+        self.items = items
+        for stage in self.stages:
+            stage.start()
+        try:
+            for item in items:
+                await self.search_stage.put(item)
+            return list(await asyncio.gather(*[item.context for item in items]))
+        finally:
+            for stage in self.stages:
+                await stage.stop()
+
+    async def search(self, item):
+        if item.urls is None:
+            await stream_output("logs", f"\n🔎 Running research for '{item.query}'...", item.output)
+            urls = await self.researcher.search_new_urls_by_query(item.query, item.output)
+        else:
+            urls = item.urls
+        await stream_output("logs", f"🤔Researching for relevant information...\n", item.output)
+        for url in urls:
+            item.pending_pages += 1
+            await self.fetch_stage.put((item, url))
+        item.searched = True
+        await self.maybe_rank(item)
+
+    async def fetch(self, work):
+        item, url = work
+        fetched = await self.scraper.fetch(url, self.client, self.limiter)
+        try:
+            await self.extract_stage.put((item, fetched))
+        except BaseException:
+            # Cancelled while waiting for room in the queue, the page won't be extracted
+            self.scraper.discard(fetched)
+            raise
+
+    async def extract(self, work):
+        item, fetched = work
+        try:
+            page = await self.scraper.extract(fetched)
+        except BaseException:
+            self.scraper.discard(fetched)
+            raise
+        if page['raw_content'] is None:
+            await self.page_done(item)
+        else:
+            await self.embed_stage.put((item, page))
+
+    async def embed(self, work):
+        item, page = work
+        await self.researcher.index_pages([page])
+        await self.page_done(item)
+
+    async def rank(self, item):
+        content = await self.researcher.get_similar_content_by_query(item.query, [], websocket=item.output)
+        await stream_output("logs", f"📃 {content}", item.output)
+        await item.output.flush(self.flush_lock)
+        item.context.set_result(content)
+
+    def discard_fetched(self, work):
+        self.scraper.discard(work[1])
+
+    async def page_done(self, item):
+        item.pending_pages -= 1
+        await self.maybe_rank(item)
+
+    async def maybe_rank(self, item):
+        # Urls are deduplicated across sub-queries and every sub-query looks up the shared index,
+        # so the sub-queries are ranked once all searches are done and every page left the pipeline
+        if not all(other.searched and other.pending_pages == 0 for other in self.items):
+            return
+        for other in self.items:
+            if not other.ranked:
+                other.ranked = True
+                await self.rank_stage.put(other)
+
+    async def search_failed(self, item, error):
+        item.searched = True
+        await self.maybe_rank(item)
+
+    async def page_failed(self, work, error):
+        await self.page_done(work[0])
+
+    async def rank_failed(self, item, error):
+        await item.output.flush(self.flush_lock)
+        if not item.context.done():
+            item.context.set_result("")
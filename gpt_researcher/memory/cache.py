@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+
+from langchain.schema.embeddings import Embeddings
+
+from gpt_researcher.utils.cache import DiskCache
+
+
+class EmbeddingStore:
+    """
+    Two tier store of embedding vectors: an in-memory LRU and an optional SQLite file.
+    One store is shared by every research run of the process. Vectors are kept as float32 arrays,
+    a 1536 dimension vector takes 6 KB instead of about 50 KB as a list of floats.
+    """
+    def __init__(self, max_size=10000, path=None, max_bytes=None):
+        """
+        Args:
+            max_size: number of vectors kept in memory
+            path: path of the on-disk tier, None to keep the cache in memory only
+            max_bytes: byte budget of the on-disk tier
+        """
+        self.max_size = max_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk = DiskCache(path, max_bytes=max_bytes) if path else None
+
+    def get(self, key):
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+                return vector.tolist()
+        if self.disk is None:
+            return None
+        entry = self.disk.get(key)
+        if entry is None:
+            return None
+        vector = array("f", entry[0])
+        self._remember(key, vector)
+        return vector.tolist()
+
+    def set(self, key, vector):
+        vector = array("f", vector)
+        self._remember(key, vector)
+        if self.disk is not None:
+            self.disk.set(key, vector.tobytes())
+
+    def _remember(self, key, vector):
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that caches vectors by provider, model and a hash of the text,
+    so a chunk is only sent to the embedding API once.
+    The async path sends the missing chunks in batches, several batches at a time.
+    """
+    def __init__(self, embeddings, provider, model, store, batch_size=100, max_concurrency=4, rate_limiter=None):
+        """
+        Args:
+            embeddings: the LangChain embeddings to wrap
+            provider: embedding provider name, part of the cache key
+            model: embedding model name, part of the cache key
+            store: EmbeddingStore holding the vectors
+            batch_size: number of chunks per embedding request on the async path
+            max_concurrency: number of embedding requests in flight on the async path
+            rate_limiter: RateLimiter of the provider, shared by every user of the model
+        """
+        self.embeddings = embeddings
+        self.provider = provider
+        self.model = model
+        self.store = store
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self._loop = None
+        self._semaphore = None
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text, kind="document"):
+        # Some providers embed queries and documents differently, e.g. with an instruction prefix
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.provider}:{self.model}:{kind}:{digest}"
+
+    def embed_documents(self, texts):
+        keys = [self._key(text) for text in texts]
+        vectors = [self.store.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            # Embed every distinct missing text once, even if it occurs several times in the batch
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            embedded = dict(zip(unique, self.embeddings.embed_documents(unique)))
+            for i in missing:
+                vectors[i] = embedded[texts[i]]
+                self.store.set(keys[i], vectors[i])
+        return vectors
+
+    def _get_semaphore(self):
+        # Shared by concurrent calls, so max_concurrency holds for the whole run.
+        # asyncio.Semaphore is bound to the event loop it is first used on.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        return self._semaphore
+
+    async def aembed_documents(self, texts):
+        keys = [self._key(text) for text in texts]
+        # The on-disk tier does blocking IO
+        vectors = await asyncio.to_thread(lambda: [self.store.get(key) for key in keys])
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            batches = [unique[i:i + self.batch_size] for i in range(0, len(unique), self.batch_size)]
+            semaphore = self._get_semaphore()
+
+            async def embed_batch(batch):
+                async with semaphore:
+                    if self.rate_limiter:
+                        await self.rate_limiter.acquire(tokens=sum(len(text) for text in batch) // 4)
+                    return await self.embeddings.aembed_documents(batch)
+
+            results = await asyncio.gather(*[embed_batch(batch) for batch in batches])
+            embedded = dict(zip(unique, (vector for result in results for vector in result)))
+            for i in missing:
+                vectors[i] = embedded[texts[i]]
+            await asyncio.to_thread(lambda: [self.store.set(keys[i], vectors[i]) for i in missing])
+        return vectors
+
+    async def aembed_query(self, text):
+        key = self._key(text, kind="query")
+        vector = await asyncio.to_thread(self.store.get, key)
+        if vector is not None:
+            self.hits += 1
+            return vector
+        self.misses += 1
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(tokens=len(text) // 4)
+        vector = await self.embeddings.aembed_query(text)
+        await asyncio.to_thread(self.store.set, key, vector)
+        return vector
+
+    def embed_query(self, text):
+        key = self._key(text, kind="query")
+        vector = self.store.get(key)
+        if vector is not None:
+            self.hits += 1
+            return vector
+        self.misses += 1
+        vector = self.embeddings.embed_query(text)
+        self.store.set(key, vector)
+        return vector
+
+    def stats(self):
+        """
+        Returns:
+            dict with the number of cache hits and misses
+        """
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,25 +1,45 @@
-from langchain.vectorstores import FAISS
+import os
+
+from gpt_researcher.utils.rate_limiter import RateLimiter
+from .cache import CachedEmbeddings, EmbeddingStore
+
+_stores = {}
+_rate_limiters = {}
 
 
 class Memory:
-    def __init__(self, embedding_provider, **kwargs):
+    def __init__(self, embedding_provider, cache_size=10000, cache_dir=None, cache_max_bytes=None,
+                 batch_size=100, max_concurrency=4, requests_per_minute=None, tokens_per_minute=None, **kwargs):
 
         _embeddings = None
         match embedding_provider:
             case "ollama":
                 from langchain.embeddings import OllamaEmbeddings
                 _embeddings = OllamaEmbeddings(model="llama2")
+                model = _embeddings.model
             case "openai":
                 from langchain.embeddings import OpenAIEmbeddings
                 _embeddings = OpenAIEmbeddings()
+                model = _embeddings.model
             case "huggingface":
                 from langchain.embeddings import HuggingFaceEmbeddings
                 _embeddings = HuggingFaceEmbeddings()
+                model = _embeddings.model_name
 
             case _:
                 raise Exception("Embedding provider not found.")
 
-        self._embeddings = _embeddings
+        # The store is shared by all Memory instances, so chunks embedded for
+        # another sub-query or another user are not embedded again.
+        path = os.path.join(cache_dir, "embeddings.db") if cache_dir else None
+        if path not in _stores:
+            _stores[path] = EmbeddingStore(max_size=cache_size, path=path, max_bytes=cache_max_bytes)
+        # Provider rate limits apply to the whole process, not to one research run
+        if (embedding_provider, model) not in _rate_limiters:
+            _rate_limiters[(embedding_provider, model)] = RateLimiter(requests_per_minute, tokens_per_minute)
+        self._embeddings = CachedEmbeddings(_embeddings, embedding_provider, model, _stores[path],
+                                            batch_size=batch_size, max_concurrency=max_concurrency,
+                                            rate_limiter=_rate_limiters[(embedding_provider, model)])
 
     def get_embeddings(self):
         return self._embeddings
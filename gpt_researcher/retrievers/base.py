@@ -0,0 +1,26 @@
+# Retriever interface
+
+# libraries
+from typing import List, Dict, Protocol
+
+
+class Retriever(Protocol):
+    """
+    Interface implemented by every retriever.
+    A retriever is created for one query and returns normalized results:
+    dicts with an "href" and a "body", and a "title" when the search API provides one.
+    """
+    def __init__(self, query: str):
+        ...
+
+    def search(self, max_results: int = 7) -> List[Dict]:
+        """
+        Searches the query, blocking the calling thread
+        """
+        ...
+
+    async def asearch(self, max_results: int = 7) -> List[Dict]:
+        """
+        Searches the query without blocking the event loop, on the shared HTTP connection pool
+        """
+        ...
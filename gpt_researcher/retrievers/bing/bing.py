@@ -5,6 +5,10 @@ import os
 import requests
 import json
 
+from gpt_researcher.utils.http import get_async_client
+
+BING_SEARCH_URL = "https://api.bing.microsoft.com/v7.0/search"
+
 
 class BingSearch():
     """
@@ -40,16 +44,34 @@ class BingSearch():
         print("Searching with query {0}...".format(self.query))
         """Useful for general internet search queries using the Bing API."""
 
-
         # Search the query
-        url = "https://api.bing.microsoft.com/v7.0/search"
+        resp = requests.get(BING_SEARCH_URL, headers=self.get_headers(), params=self.get_params(max_results))
+
+        # Preprocess the results
+        if resp is None:
+            return
+        return self.normalize_results(resp.text)
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("Searching with query {0}...".format(self.query))
+        client = get_async_client()
+        resp = await client.get(BING_SEARCH_URL, headers=self.get_headers(), params=self.get_params(max_results))
+        return self.normalize_results(resp.text) or []
 
-        headers = {
-        'Ocp-Apim-Subscription-Key': self.api_key,
-        'Content-Type': 'application/json'
+    def get_headers(self):
+        return {
+            'Ocp-Apim-Subscription-Key': self.api_key,
+            'Content-Type': 'application/json'
         }
-        params = {
-            "responseFilter" : "Webpages",
+
+    def get_params(self, max_results):
+        return {
+            "responseFilter": "Webpages",
             "q": self.query,
             "count": max_results,
             "setLang": "en-GB",
@@ -57,14 +79,18 @@ class BingSearch():
             "textFormat": "HTML",
             "safeSearch": "Strict"
         }
-        
-        resp = requests.get(url, headers=headers, params=params)
 
-        # Preprocess the results
-        if resp is None:
-            return
+    def normalize_results(self, text):
+        """
+        Parses the response of the Bing API
+        Args:
+            text: the response body
+
+        Returns:
+            list of normalized results, None if the response can't be parsed
+        """
         try:
-            search_results = json.loads(resp.text)
+            search_results = json.loads(text)
         except Exception:
             return
         if search_results is None:
@@ -0,0 +1,136 @@
+# Search result cache
+
+# libraries
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from gpt_researcher.utils.cache import DiskCache
+
+# Freshness policy of retrievers whose results go stale faster than the default ttl
+DEFAULT_SEARCH_CACHE_TTLS = {
+    "tavily_news": 15 * 60,
+}
+
+_search_caches = {}
+
+
+class SearchCache:
+    """
+    TTL cache of normalized search results, keyed by retriever, query and result count.
+    Kept in memory, and optionally in a SQLite file shared by all server workers.
+    """
+    def __init__(self, ttl, ttls=None, max_size=1000, path=None, max_bytes=None):
+        """
+        Args:
+            ttl: default number of seconds results stay fresh
+            ttls: per retriever ttl overrides, e.g. {"tavily_news": 900}
+            max_size: number of result lists kept in memory
+            path: path of the persistent store, None to keep the cache in memory only
+            max_bytes: byte budget of the persistent store
+        """
+        self.ttl = ttl
+        self.ttls = {**DEFAULT_SEARCH_CACHE_TTLS, **(ttls or {})}
+        self.max_size = max_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk = DiskCache(path, max_bytes=max_bytes) if path else None
+
+    def get_ttl(self, retriever_name):
+        return self.ttls.get(retriever_name, self.ttl)
+
+    @staticmethod
+    def get_key(retriever_name, query, max_results):
+        normalized_query = " ".join(query.lower().split())
+        return f"{retriever_name}:{max_results}:{normalized_query}"
+
+    def get(self, key):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                expires_at, results = entry
+                if expires_at > time.time():
+                    self._lru.move_to_end(key)
+                    return results
+                del self._lru[key]
+        if self.disk is None:
+            return None
+        entry = self.disk.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        results = json.loads(value)
+        self._remember(key, results, expires_at)
+        return results
+
+    def set(self, key, results, ttl):
+        if ttl <= 0:
+            return
+        self._remember(key, results, time.time() + ttl)
+        if self.disk is not None:
+            self.disk.set(key, json.dumps(results).encode("utf-8"), ttl)
+
+    def _remember(self, key, results, expires_at):
+        with self._lock:
+            self._lru[key] = (expires_at, results)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+
+class CachedRetriever:
+    """
+    Retriever wrapper answering repeated searches from the SearchCache
+    """
+    def __init__(self, query, retriever, name, cache):
+        """
+        Args:
+            query:
+            retriever: the retriever class to wrap
+            name: the retriever name used in the config, part of the cache key
+            cache: SearchCache
+        """
+        self.query = query
+        self.name = name
+        self.cache = cache
+        self.retriever = retriever(query)
+
+    def search(self, max_results=7):
+        key = self.cache.get_key(self.name, self.query, max_results)
+        results = self.cache.get(key)
+        if results is None:
+            results = list(self.retriever.search(max_results=max_results) or [])
+            if results:
+                self.cache.set(key, results, self.cache.get_ttl(self.name))
+        return list(results)
+
+    async def asearch(self, max_results=7):
+        key = self.cache.get_key(self.name, self.query, max_results)
+        results = await asyncio.to_thread(self.cache.get, key)
+        if results is None:
+            results = list(await self.retriever.asearch(max_results=max_results) or [])
+            if results:
+                await asyncio.to_thread(self.cache.set, key, results, self.cache.get_ttl(self.name))
+        return list(results)
+
+
+def get_search_cache(cfg):
+    """
+    Gets the process-wide search cache
+    Args:
+        cfg: Config
+
+    Returns:
+        SearchCache or None if the cache is disabled
+    """
+    if not cfg.search_cache:
+        return None
+    path = os.path.join(cfg.cache_dir, "search.db") if cfg.search_cache_persist else None
+    if path not in _search_caches:
+        _search_caches[path] = SearchCache(cfg.search_cache_ttl, ttls=cfg.search_cache_ttls,
+                                           max_size=cfg.search_cache_size, path=path,
+                                           max_bytes=cfg.search_cache_max_bytes)
+    return _search_caches[path]
@@ -1,3 +1,4 @@
+import asyncio
 from itertools import islice
 from duckduckgo_search import DDGS
 
@@ -18,4 +19,12 @@ class Duckduckgo:
         :return:
         """
         ddgs_gen = self.ddg.text(self.query, region='wt-wt', max_results=max_results)
-        return ddgs_gen
\ No newline at end of file
+        return ddgs_gen
+
+    async def asearch(self, max_results=5):
+        """
+        Performs the search in a worker thread, duckduckgo_search only has a blocking client
+        :param max_results:
+        :return:
+        """
+        return await asyncio.to_thread(lambda: list(self.search(max_results=max_results)))
\ No newline at end of file
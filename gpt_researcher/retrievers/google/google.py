@@ -6,6 +6,10 @@ import requests
 import json
 from tavily import TavilyClient
 
+from gpt_researcher.utils.http import get_async_client
+
+GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
 
 class GoogleSearch:
     """
@@ -58,13 +62,36 @@ class GoogleSearch:
         """
         """Useful for general internet search queries using the Google API."""
         print("Searching with query {0}...".format(self.query))
-        url = f"https://www.googleapis.com/customsearch/v1?key={self.api_key}&cx={self.cx_key}&q={self.query}&start=1"
+        url = f"{GOOGLE_SEARCH_URL}?key={self.api_key}&cx={self.cx_key}&q={self.query}&start=1"
         resp = requests.get(url)
 
         if resp is None:
             return
+        return self.normalize_results(resp.text)
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("Searching with query {0}...".format(self.query))
+        client = get_async_client()
+        params = {"key": self.api_key, "cx": self.cx_key, "q": self.query, "start": 1}
+        resp = await client.get(GOOGLE_SEARCH_URL, params=params)
+        return self.normalize_results(resp.text) or []
+
+    def normalize_results(self, text):
+        """
+        Parses the response of the Google API
+        Args:
+            text: the response body
+
+        Returns:
+            list of normalized results, None if the response can't be parsed
+        """
         try:
-            search_results = json.loads(resp.text)
+            search_results = json.loads(text)
         except Exception:
             return
         if search_results is None:
@@ -0,0 +1,90 @@
+# Multi Retriever
+
+# libraries
+import asyncio
+
+from gpt_researcher.utils.url import normalize_url
+
+
+class MultiRetriever:
+    """
+    Multi Retriever
+    Queries several retrievers in parallel and merges their results, deduplicated by normalized url.
+    Returns as soon as enough unique results are in and cancels the slower retrievers.
+    """
+    def __init__(self, query, retrievers, hedge_delay=0.0):
+        """
+        Initializes the MultiRetriever object
+        Args:
+            query:
+            retrievers: retriever classes, in order of preference
+            hedge_delay: seconds to wait for the previous retrievers before starting the next one,
+                0 starts all of them at once
+        """
+        self.query = query
+        self.hedge_delay = hedge_delay
+        self.retrievers = []
+        for retriever in retrievers:
+            try:
+                self.retrievers.append(retriever(query))
+            except Exception as e:
+                # e.g. a missing API key, the other retrievers can still answer
+                print(f"Skipping retriever {self.get_retriever_name(retriever)}: {e}")
+
+    @staticmethod
+    def get_retriever_name(retriever):
+        # Cached retrievers are partials, which have no __name__
+        name = getattr(retriever, "__name__", None)
+        if name is None:
+            name = getattr(retriever, "keywords", {}).get("name") or repr(retriever)
+        return name
+
+    def search(self, max_results=7):
+        """
+        Searches the query with one retriever after the other until there are enough results
+        Returns:
+
+        """
+        merged = {}
+        for retriever in self.retrievers:
+            try:
+                self._merge(merged, retriever.search(max_results=max_results))
+            except Exception as e:
+                print(f"Retriever {type(retriever).__name__} failed: {e}")
+            if len(merged) >= max_results:
+                break
+        return list(merged.values())[:max_results]
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query with all retrievers in parallel, starting them hedge_delay seconds apart
+        Returns:
+
+        """
+        merged = {}
+        waiting = list(self.retrievers)
+        pending = set()
+        try:
+            while waiting or pending:
+                if waiting:
+                    pending.add(asyncio.create_task(waiting.pop(0).asearch(max_results=max_results)))
+                done, pending = await asyncio.wait(pending, timeout=self.hedge_delay if waiting else None,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        print(f"Retriever failed: {task.exception()}")
+                    else:
+                        self._merge(merged, task.result())
+                if len(merged) >= max_results:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        return list(merged.values())[:max_results]
+
+    @staticmethod
+    def _merge(merged, results):
+        for result in results or []:
+            href = result.get("href")
+            if href:
+                merged.setdefault(normalize_url(href), result)
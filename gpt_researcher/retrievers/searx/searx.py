@@ -5,6 +5,8 @@ import os
 from tavily import TavilyClient
 from langchain.utilities import SearxSearchWrapper
 
+from gpt_researcher.utils.http import get_async_client
+
 
 class SearxSearch():
     """
@@ -45,3 +47,17 @@ class SearxSearch():
         # Normalizing results to match the format of the other search APIs
         search_response = [{"href": obj["link"], "body": obj["snippet"]} for obj in results]
         return search_response
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop, using the JSON API of the Searx instance
+        Returns:
+
+        """
+        client = get_async_client()
+        resp = await client.get(f"{self.api_key.rstrip('/')}/search", params={"q": self.query, "format": "json"})
+        resp.raise_for_status()
+        results = resp.json().get("results", [])[:max_results]
+        # Normalizing results to match the format of the other search APIs
+        search_response = [{"href": obj["url"], "body": obj.get("content", "")} for obj in results]
+        return search_response
@@ -5,6 +5,8 @@ import os
 import requests
 import json
 
+from gpt_researcher.utils.http import get_async_client
+
 
 class SerpApiSearch():
     """
@@ -53,8 +55,31 @@ class SerpApiSearch():
         # Preprocess the results
         if resp is None:
             return
+        return self.normalize_results(resp.text)
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("Searching with query {0}...".format(self.query))
+        client = get_async_client()
+        params = {"engine": "google", "q": self.query, "api_key": self.api_key}
+        resp = await client.get("https://serpapi.com/search.json", params=params)
+        return self.normalize_results(resp.text) or []
+
+    def normalize_results(self, text):
+        """
+        Parses the response of SerpApi
+        Args:
+            text: the response body
+
+        Returns:
+            list of normalized results, None if the response can't be parsed
+        """
         try:
-            search_results = json.loads(resp.text)
+            search_results = json.loads(text)
         except Exception:
             return
         if search_results is None:
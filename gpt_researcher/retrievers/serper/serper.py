@@ -5,6 +5,10 @@ import os
 import requests
 import json
 
+from gpt_researcher.utils.http import get_async_client
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+
 
 class SerperSearch():
     """
@@ -43,21 +47,44 @@ class SerperSearch():
 
 
         # Search the query (see https://serper.dev/playground for the format)
-        url = "https://google.serper.dev/search"
-
-        headers = {
-        'X-API-KEY': self.api_key,
-        'Content-Type': 'application/json'
-        }
         data = json.dumps({"q": self.query})
 
-        resp = requests.request("POST", url, headers=headers, data=data)
+        resp = requests.request("POST", SERPER_SEARCH_URL, headers=self.get_headers(), data=data)
 
         # Preprocess the results
         if resp is None:
             return
+        return self.normalize_results(resp.text)
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("Searching with query {0}...".format(self.query))
+        client = get_async_client()
+        data = json.dumps({"q": self.query})
+        resp = await client.post(SERPER_SEARCH_URL, headers=self.get_headers(), content=data)
+        return self.normalize_results(resp.text) or []
+
+    def get_headers(self):
+        return {
+            'X-API-KEY': self.api_key,
+            'Content-Type': 'application/json'
+        }
+
+    def normalize_results(self, text):
+        """
+        Parses the response of the Serper API
+        Args:
+            text: the response body
+
+        Returns:
+            list of normalized results, None if the response can't be parsed
+        """
         try:
-            search_results = json.loads(resp.text)
+            search_results = json.loads(text)
         except Exception:
             return
         if search_results is None:
@@ -4,6 +4,10 @@
 import os
 from tavily import TavilyClient
 
+from gpt_researcher.utils.http import get_async_client
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
 
 class TavilyNews():
     """
@@ -45,3 +49,21 @@ class TavilyNews():
         # Return the results
         search_response = [{"href": obj["url"], "body": obj["content"]} for obj in results.get("results", [])]
         return search_response
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        client = get_async_client()
+        resp = await client.post(TAVILY_SEARCH_URL, json={
+            "api_key": self.api_key,
+            "query": self.query,
+            "search_depth": "advanced",
+            "topic": "news",
+            "max_results": max_results,
+        })
+        resp.raise_for_status()
+        search_response = [{"href": obj["url"], "body": obj["content"]} for obj in resp.json().get("results", [])]
+        return search_response
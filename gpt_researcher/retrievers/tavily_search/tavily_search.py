@@ -1,10 +1,15 @@
 # Tavily API Retriever
 
 # libraries
+import asyncio
 import os
 from tavily import TavilyClient
 from duckduckgo_search import DDGS
 
+from gpt_researcher.utils.http import get_async_client
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
 
 class TavilySearch():
     """
@@ -54,3 +59,30 @@ class TavilySearch():
                 print("Fallback search failed:", str(e))
                 search_response = []
         return search_response
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+        """
+        try:
+            # Search the query using the Tavily REST API on the shared connection pool
+            client = get_async_client()
+            resp = await client.post(TAVILY_SEARCH_URL, json={
+                "api_key": self.api_key,
+                "query": self.query,
+                "search_depth": "advanced",
+                "max_results": max_results,
+            })
+            resp.raise_for_status()
+            search_response = [{"href": obj["url"], "body": obj["content"]} for obj in resp.json().get("results", [])]
+        except Exception as e:
+            try:
+                # Fallback to DuckDuckGo search, which only has a blocking client
+                search_response = await asyncio.to_thread(
+                    lambda: list(DDGS().text(self.query, region='wt-wt', max_results=max_results)))
+            except Exception as e:
+                # Handle the fallback exception
+                print("Fallback search failed:", str(e))
+                search_response = []
+        return search_response
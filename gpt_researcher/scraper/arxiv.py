@@ -0,0 +1,166 @@
+import asyncio
+import os
+import re
+import weakref
+import xml.etree.ElementTree as ElementTree
+
+from gpt_researcher.utils.cache import DiskCache
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_PDF_URL = "https://arxiv.org/pdf/{}"
+ATOM_NAMESPACE = {"atom": "http://www.w3.org/2005/Atom"}
+
+# New style ids like 2101.00001 and old style ids like hep-th/9901001 or math.AG/0309136
+ARXIV_ID = r"\d{4}\.\d{4,5}|[a-z-]+(?:\.[A-Z]{2})?/\d{7}"
+ARXIV_URL_PATTERN = re.compile(
+    rf"^https?://(?:www\.|export\.)?arxiv\.org/(?:abs|pdf|html|format)/(?P<id>{ARXIV_ID})(?P<version>v\d+)?"
+    r"(?:\.pdf)?/?(?:[?#].*)?$", re.IGNORECASE)
+ARXIV_ENTRY_ID_PATTERN = re.compile(rf"/abs/(?P<id>{ARXIV_ID})(?P<version>v\d+)?$")
+
+_batchers = weakref.WeakKeyDictionary()
+_arxiv_caches = {}
+
+
+def parse_arxiv_id(url):
+    """
+    Parses the paper id out of an arXiv abs, pdf or html url
+
+    Args:
+        url (str): The url
+
+    Returns:
+        tuple: (id, version), the version is None if the url doesn't pin one; None if the url isn't a paper
+    """
+    match = ARXIV_URL_PATTERN.match(url or "")
+    if not match:
+        return None
+    return match.group("id"), match.group("version")
+
+
+def parse_feed(feed):
+    """
+    Parses an arXiv API response
+
+    Returns:
+        dict mapping the id of every paper to a dict with its latest 'version', 'title' and 'summary'
+    """
+    papers = {}
+    for entry in ElementTree.fromstring(feed).iterfind("atom:entry", ATOM_NAMESPACE):
+        match = ARXIV_ENTRY_ID_PATTERN.search(entry.findtext("atom:id", "", ATOM_NAMESPACE).strip())
+        if not match:
+            # Unknown or malformed ids come back as an error entry
+            continue
+        papers[match.group("id")] = {
+            "version": match.group("version") or "",
+            "title": " ".join(entry.findtext("atom:title", "", ATOM_NAMESPACE).split()),
+            "summary": " ".join(entry.findtext("atom:summary", "", ATOM_NAMESPACE).split()),
+        }
+    return papers
+
+
+class ArxivMetadataBatcher:
+    """
+    Looks up arXiv papers in batches: the ids requested within a short delay of each other
+    are sent to the API together as one id_list query
+    """
+    def __init__(self, client, max_batch_size=20, delay=0.1):
+        """
+        Args:
+            client: httpx.AsyncClient used for the API
+            max_batch_size: maximum number of ids per query
+            delay: how long the first id of a batch waits for others
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.delay = delay
+        self.pending = {}
+        self._flush_task = None
+        self._tasks = set()
+
+    async def get(self, arxiv_id):
+        """
+        Gets the metadata of a paper
+        Args:
+            arxiv_id: the id of the paper, without version
+
+        Returns:
+            dict with 'version', 'title' and 'summary', or None if arXiv doesn't know the id
+        """
+        future = self.pending.get(arxiv_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.pending[arxiv_id] = future
+            if len(self.pending) >= self.max_batch_size:
+                if self._flush_task:
+                    self._flush_task.cancel()
+                self._start(self._query(self._take()))
+            elif self._flush_task is None:
+                self._flush_task = self._start(self._flush_later())
+        # Other callers may be waiting for the same paper
+        return await asyncio.shield(future)
+
+    def _start(self, coroutine):
+        # Keep a reference, the event loop only holds weak references to tasks
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _take(self):
+        batch, self.pending = self.pending, {}
+        self._flush_task = None
+        return batch
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.delay)
+        await self._query(self._take())
+
+    async def _query(self, batch):
+        try:
+            params = {"id_list": ",".join(batch), "max_results": len(batch)}
+            response = await self.client.get(ARXIV_API_URL, params=params)
+            response.raise_for_status()
+            papers = parse_feed(response.content)
+            for arxiv_id, future in batch.items():
+                if not future.done():
+                    future.set_result(papers.get(arxiv_id))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+
+
+def get_arxiv_batcher(client, cfg):
+    """
+    Gets the metadata batcher of the running event loop
+    Args:
+        client: httpx.AsyncClient used for the API
+        cfg: Config
+
+    Returns:
+        ArxivMetadataBatcher
+    """
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None or batcher.client is not client:
+        batcher = ArxivMetadataBatcher(client, max_batch_size=cfg.arxiv_batch_size, delay=cfg.arxiv_batch_delay)
+        _batchers[loop] = batcher
+    return batcher
+
+
+def get_arxiv_cache(cfg):
+    """
+    Gets the process-wide cache of extracted paper text, keyed by id and version.
+    A version of a paper never changes, so the entries don't expire.
+    Args:
+        cfg: Config
+
+    Returns:
+        DiskCache or None if the cache is disabled
+    """
+    if not cfg.arxiv_cache:
+        return None
+    path = os.path.join(cfg.cache_dir, "arxiv.db")
+    if path not in _arxiv_caches:
+        _arxiv_caches[path] = DiskCache(path, max_bytes=cfg.arxiv_cache_max_bytes)
+    return _arxiv_caches[path]
@@ -0,0 +1,207 @@
+import asyncio
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from colorama import Fore, Style
+
+from gpt_researcher.scraper.browser import get_browser_executor, get_browser_pool
+from gpt_researcher.scraper.sniff import SNIFF_BYTES, get_declared_kind, sniff_kind
+
+# Tier of the backend that worked for each domain, most recently used last
+_domain_tiers = OrderedDict()
+MAX_DOMAINS = 10000
+# Bytes of a pdf download collected before they are written to the spool file
+SPOOL_WRITE_BYTES = 1024 * 1024
+
+
+def get_scraper_backend(name, cfg):
+    """
+    Gets a scraper backend
+    Args:
+        name: backend name, "static" for plain HTTP or "selenium" to render javascript in a browser
+        cfg: Config
+
+    Returns:
+        backend with an async fetch(link, client, headers) returning the downloaded page
+    """
+    match name:
+        case "static":
+            backend = StaticBackend(cfg)
+        case "selenium":
+            backend = SeleniumBackend(cfg)
+
+        case _:
+            raise Exception("Scraper backend not found.")
+
+    return backend
+
+
+def get_domain(link):
+    return urlparse(link).hostname or ""
+
+
+def get_domain_tier(link):
+    """
+    Gets the tier that worked for the link's domain before, 0 if the domain is new
+    """
+    return _domain_tiers.get(get_domain(link), 0)
+
+
+def remember_domain_tier(link, tier):
+    """
+    Remembers the tier that worked for the link's domain, so its next pages skip the tiers below
+    """
+    domain = get_domain(link)
+    _domain_tiers[domain] = tier
+    _domain_tiers.move_to_end(domain)
+    while len(_domain_tiers) > MAX_DOMAINS:
+        _domain_tiers.popitem(last=False)
+
+
+class StaticBackend:
+    """
+    Downloads pages with plain HTTP requests on the shared async client
+    """
+    def __init__(self, cfg):
+        self.cfg = cfg
+
+    async def fetch(self, link, client, headers):
+        """
+        Streams the body of the link, deciding from the Content-Type header and the first bytes
+        whether it is worth downloading. Binaries, media, error pages and bodies over the size cap
+        are abandoned as soon as that is known.
+        Returns:
+            dict with the 'url', 'status_code', 'headers' and 'kind' ("html", "text", "pdf" or None),
+            for html and text the 'content' bytes and their 'encoding', for pdfs the 'path' of the spooled file
+        """
+        async with client.stream("GET", link, headers=headers, timeout=self.cfg.scraper_timeout) as response:
+            fetched = {'url': link, 'status_code': response.status_code, 'headers': response.headers, 'kind': None}
+            if not response.is_success:
+                return fetched
+            declared_kind = get_declared_kind(response.headers.get("content-type"))
+            max_bytes = self.cfg.scraper_max_pdf_bytes if declared_kind == "pdf" else self.cfg.scraper_max_body_bytes
+            content_length = response.headers.get("content-length", "")
+            if declared_kind is None or (content_length.isdigit() and int(content_length) > max_bytes):
+                return fetched
+
+            body = bytearray()
+            kind = None
+            # One iterator, so a pdf can carry on from where sniffing stopped
+            chunks = response.aiter_bytes()
+            async for chunk in chunks:
+                body += chunk
+                if kind is None and len(body) >= SNIFF_BYTES:
+                    kind = sniff_kind(bytes(body[:SNIFF_BYTES]), declared_kind)
+                    if kind is None:
+                        return fetched
+                    if kind == "pdf":
+                        break
+                if len(body) > self.cfg.scraper_max_body_bytes:
+                    return fetched
+            if kind is None:
+                kind = sniff_kind(bytes(body), declared_kind)
+                if kind is None:
+                    return fetched
+            if kind == "pdf":
+                path = await self.spool(body, chunks)
+                return {**fetched, 'kind': kind, 'path': path} if path else fetched
+            return {**fetched, 'kind': kind, 'content': bytes(body), 'encoding': response.charset_encoding}
+
+    async def spool(self, head, chunks):
+        """
+        Writes a pdf download to a temporary file, so the pages can be read by several processes
+        without holding the whole file in memory
+        Args:
+            head: the bytes already downloaded
+            chunks: iterator over the rest of the body
+
+        Returns:
+            str: the path of the file, None if the pdf is over the size cap
+        """
+        # The file is created, written and removed in threads, the writes are batched so that a
+        # large download doesn't start a thread for every network chunk
+        file = await asyncio.to_thread(tempfile.NamedTemporaryFile, suffix=".pdf", delete=False)
+        size = len(head)
+        batch = [head]
+        batch_size = size
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > self.cfg.scraper_max_pdf_bytes:
+                    break
+                batch.append(chunk)
+                batch_size += len(chunk)
+                if batch_size >= SPOOL_WRITE_BYTES:
+                    await asyncio.to_thread(file.write, b"".join(batch))
+                    batch = []
+                    batch_size = 0
+            if size <= self.cfg.scraper_max_pdf_bytes:
+                await asyncio.to_thread(file.write, b"".join(batch))
+            await asyncio.to_thread(file.close)
+        except BaseException:
+            # e.g. a failed or cancelled download, the thread removes the file even if the task is cancelled again
+            await asyncio.to_thread(_remove_spool_file, file)
+            raise
+        if size > self.cfg.scraper_max_pdf_bytes:
+            await asyncio.to_thread(_remove_spool_file, file)
+            return None
+        return file.name
+
+
+def _remove_spool_file(file):
+    file.close()
+    os.remove(file.name)
+
+
+class SeleniumBackend:
+    """
+    Renders pages in the pooled headless browsers, for sites that build their content with javascript
+    """
+    # A browser that failed to start isn't retried for every page
+    retry_after = 300
+    _unavailable_until = 0.0
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+
+    def is_available(self):
+        return time.monotonic() >= SeleniumBackend._unavailable_until
+
+    async def fetch(self, link, client=None, headers=None):
+        """
+        Renders the link
+        Returns:
+            dict like StaticBackend.fetch, with the rendered html as 'content'
+        """
+        fetched = {'url': link, 'status_code': None, 'headers': {}, 'kind': None}
+        if not self.is_available():
+            return fetched
+        loop = asyncio.get_running_loop()
+        html = await loop.run_in_executor(get_browser_executor(self.cfg), self.render, link)
+        if html is None:
+            return fetched
+        return {**fetched, 'status_code': 200, 'kind': "html", 'content': html, 'encoding': None}
+
+    def render(self, link):
+        # selenium is only needed when pages are rendered
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.wait import WebDriverWait
+
+        started = False
+        try:
+            with get_browser_pool(cfg=self.cfg).driver() as driver:
+                started = True
+                driver.get(link)
+                WebDriverWait(driver, self.cfg.browser_page_load_timeout).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+                return driver.execute_script("return document.documentElement.outerHTML;")
+        except Exception as e:
+            if not started:
+                print(f"{Fore.RED}Browser unavailable, not rendering pages for {self.retry_after}s: {e}{Style.RESET_ALL}")
+                SeleniumBackend._unavailable_until = time.monotonic() + self.retry_after
+            return None
@@ -0,0 +1,258 @@
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from sys import platform
+
+from gpt_researcher.config import Config
+
+# Requests for these are dropped by chrome, the text of a page doesn't need them
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav", "*.m4a", "*.avi", "*.mov",
+]
+
+_pools = {}
+_pools_lock = threading.Lock()
+_executor = None
+
+
+def create_driver(browser, user_agent, page_load_timeout=15):
+    """
+    Starts a headless driver with a lightweight profile: images, fonts and media are blocked
+    and pages count as loaded once the DOM is ready
+
+    Args:
+        browser (str): "chrome", "firefox" or "safari"
+        user_agent (str): The user agent of the browser
+        page_load_timeout (float): Seconds before a page load is abandoned
+
+    Returns:
+        WebDriver: The driver
+    """
+    # selenium is only needed when pages are rendered
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.safari.options import Options as SafariOptions
+
+    logging.getLogger("selenium").setLevel(logging.CRITICAL)
+
+    match browser:
+        case "firefox":
+            options = FirefoxOptions()
+            options.add_argument("--headless")
+            options.page_load_strategy = "eager"
+            options.set_preference("general.useragent.override", user_agent)
+            options.set_preference("permissions.default.image", 2)
+            options.set_preference("gfx.downloadable_fonts.enabled", False)
+            options.set_preference("media.autoplay.default", 5)
+            options.set_preference("media.mediasource.enabled", False)
+            driver = webdriver.Firefox(options=options)
+        case "safari":
+            # Safari can't run headless and only allows one session
+            # See https://developer.apple.com/documentation/webkit/testing_with_webdriver_in_safari
+            options = SafariOptions()
+            options.page_load_strategy = "eager"
+            driver = webdriver.Safari(options=options)
+        case _:
+            options = ChromeOptions()
+            options.add_argument("--headless=new")
+            options.add_argument(f"user-agent={user_agent}")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--disable-extensions")
+            options.add_argument("--mute-audio")
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            if platform == "linux" or platform == "linux2":
+                options.add_argument("--disable-dev-shm-usage")
+            # No fixed --remote-debugging-port, chromedriver picks a free one for every browser
+            options.page_load_strategy = "eager"
+            options.add_experimental_option("prefs", {
+                "download_restrictions": 3,
+                "profile.managed_default_content_settings.images": 2,
+            })
+            driver = webdriver.Chrome(options=options)
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    driver.set_page_load_timeout(page_load_timeout)
+    return driver
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.last_used = time.monotonic()
+
+
+class BrowserPool:
+    """
+    Pool of warm headless drivers shared by the threads that render pages.
+    A driver is restarted after a number of pages, so leaks of long lived browsers don't pile up,
+    and closed once it has been idle for a while.
+    """
+    def __init__(self, browser="chrome", user_agent=None, max_drivers=4, max_pages_per_driver=50,
+                 idle_timeout=300, page_load_timeout=15):
+        """
+        Args:
+            browser: "chrome", "firefox" or "safari"
+            user_agent: user agent of the browsers
+            max_drivers: maximum number of browsers running at a time
+            max_pages_per_driver: pages rendered by a browser before it is restarted
+            idle_timeout: seconds after which an unused browser is closed
+            page_load_timeout: seconds before a page load is abandoned
+        """
+        self.browser = browser
+        self.user_agent = user_agent
+        self.max_drivers = 1 if browser == "safari" else max(1, max_drivers)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.idle_timeout = idle_timeout
+        self.page_load_timeout = page_load_timeout
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        threading.Thread(target=self._evict_idle_forever, daemon=True).start()
+
+    @contextmanager
+    def driver(self):
+        """
+        Borrows a driver, waiting for one if all of them are busy.
+        A driver that raised is closed instead of going back to the pool.
+        """
+        pooled = self._acquire()
+        healthy = False
+        try:
+            yield pooled.driver
+            healthy = True
+        finally:
+            self._release(pooled, healthy)
+
+    def _acquire(self):
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("The browser pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_drivers:
+                    self._size += 1
+                    break
+                self._condition.wait()
+        try:
+            return _PooledDriver(create_driver(self.browser, self.user_agent, self.page_load_timeout))
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, pooled, healthy):
+        pooled.pages += 1
+        pooled.last_used = time.monotonic()
+        with self._condition:
+            keep = healthy and pooled.pages < self.max_pages_per_driver and not self._closed
+            if keep:
+                self._idle.append(pooled)
+            else:
+                self._size -= 1
+            self._condition.notify()
+        if not keep:
+            self._quit(pooled)
+
+    def evict_idle(self):
+        """
+        Closes the drivers that haven't been used for idle_timeout seconds
+        """
+        now = time.monotonic()
+        with self._condition:
+            expired = [pooled for pooled in self._idle if now - pooled.last_used >= self.idle_timeout]
+            self._idle = [pooled for pooled in self._idle if pooled not in expired]
+            self._size -= len(expired)
+            self._condition.notify_all()
+        for pooled in expired:
+            self._quit(pooled)
+
+    def _evict_idle_forever(self):
+        while not self._closed:
+            time.sleep(max(1.0, self.idle_timeout / 2))
+            self.evict_idle()
+
+    def close(self):
+        """
+        Closes every idle driver, busy drivers are closed when they are released
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+
+def get_browser_pool(browser=None, user_agent=None, cfg=None):
+    """
+    Gets the process-wide pool of the given browser and user agent
+    Args:
+        browser: "chrome", "firefox" or "safari", defaults to the configured browser
+        user_agent: defaults to the configured user agent
+        cfg: Config used to size the pool the first time it is created
+
+    Returns:
+        BrowserPool
+    """
+    cfg = cfg or Config()
+    browser = browser or cfg.selenium_web_browser
+    user_agent = user_agent or cfg.user_agent
+    with _pools_lock:
+        pool = _pools.get((browser, user_agent))
+        if pool is None:
+            pool = BrowserPool(browser, user_agent,
+                               max_drivers=cfg.browser_max_drivers,
+                               max_pages_per_driver=cfg.browser_max_pages_per_driver,
+                               idle_timeout=cfg.browser_idle_timeout,
+                               page_load_timeout=cfg.browser_page_load_timeout)
+            _pools[(browser, user_agent)] = pool
+    return pool
+
+
+def get_browser_executor(cfg=None):
+    """
+    Gets the process-wide executor for the blocking selenium calls, one thread per pooled driver
+    """
+    global _executor
+    with _pools_lock:
+        if _executor is None:
+            cfg = cfg or Config()
+            _executor = ThreadPoolExecutor(max_workers=cfg.browser_max_drivers, thread_name_prefix="browser")
+    return _executor
+
+
+def close_browser_pools():
+    """
+    Closes every browser pool and the executor
+    """
+    global _executor
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        executor, _executor = _executor, None
+    for pool in pools:
+        pool.close()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(close_browser_pools)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+import re
+import time
+
+from gpt_researcher.utils.cache import DiskCache
+
+_scrape_caches = {}
+
+
+class CachedPage:
+    """
+    A scraped page stored in the ScrapeCache
+    """
+    def __init__(self, raw_content, expires_at=None, etag=None, last_modified=None):
+        self.raw_content = raw_content
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_stale(self):
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+    def validation_headers(self):
+        """
+        Headers that turn a GET into a conditional GET for this page
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """
+    Persistent cache mapping a url to its extracted raw_content.
+    Stale pages are kept so they can be revalidated with a conditional GET.
+    """
+    def __init__(self, path, ttl, max_bytes=None):
+        """
+        Args:
+            path: path of the cache database
+            ttl: default freshness lifetime in seconds, used when the server doesn't send max-age
+            max_bytes: byte budget of the cache
+        """
+        self.ttl = ttl
+        self.store = DiskCache(path, max_bytes=max_bytes)
+
+    async def get(self, url):
+        """
+        Gets a page from the cache, fresh or stale
+        Returns:
+            CachedPage or None
+        """
+        entry = await asyncio.to_thread(self.store.get, url, include_expired=True)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        data = json.loads(value)
+        return CachedPage(data["raw_content"], expires_at, data.get("etag"), data.get("last_modified"))
+
+    async def set(self, url, raw_content, headers=None):
+        """
+        Stores a page
+        Args:
+            url: the url of the page
+            raw_content: the extracted text
+            headers: the response headers, used for the freshness lifetime and the validators
+        """
+        headers = headers or {}
+        ttl = self.get_ttl(headers)
+        if ttl is None:
+            return
+        value = json.dumps({
+            "raw_content": raw_content,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+        })
+        await asyncio.to_thread(self.store.set, url, value.encode("utf-8"), ttl)
+
+    async def refresh(self, url, headers=None):
+        """
+        Extends the lifetime of a page after the server answered 304 Not Modified
+        """
+        ttl = self.get_ttl(headers or {})
+        if ttl is None:
+            await asyncio.to_thread(self.store.delete, url)
+        else:
+            await asyncio.to_thread(self.store.set_expiry, url, ttl)
+
+    def get_ttl(self, headers):
+        """
+        Gets the freshness lifetime from the Cache-Control header
+        Returns:
+            seconds, or None if the response must not be stored
+        """
+        cache_control = headers.get("cache-control", "").lower()
+        if "no-store" in cache_control:
+            return None
+        if "no-cache" in cache_control:
+            return 0
+        max_age = re.search(r"max-age=(\d+)", cache_control)
+        if max_age:
+            return int(max_age.group(1))
+        return self.ttl
+
+
+def get_scrape_cache(cfg):
+    """
+    Gets the process-wide scrape cache
+    Args:
+        cfg: Config
+
+    Returns:
+        ScrapeCache or None if the cache is disabled
+    """
+    if not cfg.scrape_cache:
+        return None
+    path = os.path.join(cfg.cache_dir, "scrape.db")
+    if path not in _scrape_caches:
+        _scrape_caches[path] = ScrapeCache(path, ttl=cfg.scrape_cache_ttl, max_bytes=cfg.scrape_cache_max_bytes)
+    return _scrape_caches[path]
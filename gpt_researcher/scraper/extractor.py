@@ -0,0 +1,143 @@
+import re
+
+from lxml import etree
+
+TEXT_TAGS = ("p", "h1", "h2", "h3", "h4", "h5")
+SKIPPED_TAGS = ("script", "style")
+BOILERPLATE_TAGS = ("nav", "header", "footer", "aside", "form", "noscript")
+BOILERPLATE_PATTERN = re.compile(
+    r"(^|[\s_-])(nav|navbar|menu|breadcrumbs?|footer|sidebar|cookies?|consent|banner|share|social|"
+    r"related|comments?|advert|ads?|promo|newsletter|subscribe|popup|modal)($|[\s_-])",
+    re.IGNORECASE,
+)
+DECLARED_ENCODING_PATTERN = re.compile(
+    rb"^\s*<\?xml[^>]*encoding=[\'\"]([\w.:-]+)|<\s*meta[^>]+charset\s*=\s*[\'\"]?([\w.:-]+)", re.IGNORECASE)
+
+
+class _TextTarget:
+    """
+    lxml parser target collecting the text of the text tags while the document is parsed,
+    so no element tree is built
+    """
+    def __init__(self, tags, remove_boilerplate, max_link_density):
+        self.tags = frozenset(tags)
+        self.remove_boilerplate = remove_boilerplate
+        self.max_link_density = max_link_density
+        # Blocks are kept in the order of their start tags, nested blocks included
+        self.blocks = []
+        self.open_blocks = []
+        # Open elements of the subtree being skipped, e.g. a script or, with remove_boilerplate, a nav
+        self.skipped = []
+        self.link_depth = 0
+
+    def _is_boilerplate(self, tag, attrib):
+        if tag in BOILERPLATE_TAGS or attrib.get("role") in ("navigation", "banner", "contentinfo"):
+            return True
+        return bool(BOILERPLATE_PATTERN.search(f"{attrib.get('class', '')} {attrib.get('id', '')}"))
+
+    def start(self, tag, attrib):
+        if self.skipped:
+            self.skipped.append(tag)
+            return
+        if tag in SKIPPED_TAGS or (self.remove_boilerplate and self._is_boilerplate(tag, attrib)):
+            self.skipped.append(tag)
+            return
+        if tag == "a":
+            self.link_depth += 1
+        if tag in self.tags:
+            block = [[], 0]
+            self.blocks.append(block)
+            self.open_blocks.append((tag, block))
+
+    def end(self, tag):
+        if self.skipped:
+            self.skipped.pop()
+            return
+        if tag == "a":
+            self.link_depth = max(0, self.link_depth - 1)
+        if self.open_blocks and self.open_blocks[-1][0] == tag:
+            self.open_blocks.pop()
+
+    def data(self, data):
+        if self.skipped:
+            return
+        for _, block in self.open_blocks:
+            block[0].append(data)
+            if self.link_depth:
+                block[1] += len(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        text = []
+        for parts, link_chars in self.blocks:
+            block = "".join(parts)
+            if self.remove_boilerplate and link_chars > self.max_link_density * len(block.strip()):
+                continue
+            text.append(block)
+        return "\n".join(text) + "\n" if text else ""
+
+
+def clean_text(text):
+    """
+    Strips every line and splits on double spaces, dropping the empty chunks
+
+    Args:
+        text (str): The text to clean up
+
+    Returns:
+        str: One chunk per line
+    """
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+def _decode(html, encoding=None):
+    """
+    Decodes the page like BeautifulSoup does, trying the given encoding, the byte order mark,
+    the declared encoding and utf-8 in turn, then falling back to windows-1252
+    """
+    if not isinstance(html, bytes):
+        return html
+    declared = DECLARED_ENCODING_PATTERN.search(html)
+    candidates = [
+        encoding,
+        "utf-8-sig" if html.startswith(b"\xef\xbb\xbf") else None,
+        "utf-16" if html.startswith((b"\xff\xfe", b"\xfe\xff")) else None,
+        (declared.group(1) or declared.group(2)).decode("ascii") if declared else None,
+        "utf-8",
+    ]
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            return html.decode(candidate)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return html.decode("windows-1252", errors="replace")
+
+
+def extract_text(html, encoding=None, tags=TEXT_TAGS, remove_boilerplate=False, max_link_density=0.5):
+    """
+    Extracts the text of the paragraphs and headings of an html page.
+    The page is parsed in a single pass with lxml without building a tree, the output is the same as the
+    BeautifulSoup extraction followed by clean_text.
+
+    Args:
+        html (bytes | str): The raw html
+        encoding (str, optional): The encoding announced by the server, detected from the page if None
+        tags (tuple, optional): The tags to take the text from
+        remove_boilerplate (bool, optional): Skip navigation, headers, footers, sidebars and link lists
+        max_link_density (float, optional): With remove_boilerplate, the largest share of link text a block may have
+
+    Returns:
+        str: The cleaned up text
+    """
+    if not html:
+        return ""
+    target = _TextTarget(tags, remove_boilerplate, max_link_density)
+    parser = etree.HTMLParser(target=target, remove_comments=True, recover=True)
+    parser.feed(_decode(html, encoding))
+    return clean_text(parser.close())
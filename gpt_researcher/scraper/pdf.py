@@ -0,0 +1,64 @@
+import re
+
+import fitz
+
+from gpt_researcher.scraper.extractor import clean_text
+
+# Pages extracted by one worker task, enough to make opening the document worth it
+PAGES_PER_TASK = 8
+
+HYPHENATED_LINE_BREAK = re.compile(r"(\w)-\n(\w)")
+
+
+def get_page_count(path):
+    """
+    Gets the number of pages of a pdf
+
+    Args:
+        path (str): The path of the pdf
+
+    Returns:
+        int: The number of pages
+    """
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def extract_pages(path, start, stop, max_chars=None):
+    """
+    Extracts the text of a range of pages of a pdf. Several ranges of the same file can be
+    extracted at the same time in different processes.
+
+    Args:
+        path (str): The path of the pdf
+        start (int): The first page
+        stop (int): The page after the last page
+        max_chars (int, optional): Stop once this many characters were extracted
+
+    Returns:
+        str: The cleaned up text of the pages
+    """
+    pages = []
+    length = 0
+    with fitz.open(path) as doc:
+        for number in range(start, min(stop, doc.page_count)):
+            text = doc[number].get_text("text")
+            # Join the words hyphenated over a line break
+            text = clean_text(HYPHENATED_LINE_BREAK.sub(r"\1\2", text))
+            pages.append(text)
+            length += len(text)
+            if max_chars and length >= max_chars:
+                break
+    return "\n".join(page for page in pages if page)
+
+
+def get_page_ranges(page_count, max_pages=None):
+    """
+    Splits the pages of a pdf in ranges of PAGES_PER_TASK pages
+
+    Returns:
+        list of (start, stop) tuples
+    """
+    if max_pages:
+        page_count = min(page_count, max_pages)
+    return [(start, min(start + PAGES_PER_TASK, page_count)) for start in range(0, page_count, PAGES_PER_TASK)]
@@ -1,108 +1,238 @@
-from concurrent.futures.thread import ThreadPoolExecutor
-from langchain.document_loaders import PyMuPDFLoader
-from langchain.retrievers import ArxivRetriever
-from functools import partial
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import os
+
+from gpt_researcher.config import Config
+from gpt_researcher.utils.http import get_async_client, get_scraper_limiter
+from gpt_researcher.utils.process_pool import run_in_process
+from gpt_researcher.scraper.arxiv import ARXIV_PDF_URL, get_arxiv_batcher, get_arxiv_cache, parse_arxiv_id
+from gpt_researcher.scraper.cache import get_scrape_cache
+from gpt_researcher.scraper.extractor import clean_text, extract_text
+from gpt_researcher.scraper.pdf import extract_pages, get_page_count, get_page_ranges
+from gpt_researcher.scraper.backends import StaticBackend, get_domain_tier, get_scraper_backend, remember_domain_tier
+from gpt_researcher.scraper.sniff import looks_like_js_shell
 
 
 class Scraper:
     """
     Scraper class to extract the content from the links
     """
-    def __init__(self, urls, user_agent):
+    def __init__(self, urls, user_agent, cfg=None):
         """
         Initialize the Scraper class.
         Args:
             urls:
+            user_agent:
+            cfg: Config (optional)
         """
         self.urls = urls
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.cfg = cfg if cfg else Config()
+        self.headers = {
             "User-Agent": user_agent
-        })
-
-    def run(self):
+        }
+        self.cache = get_scrape_cache(self.cfg)
+        # Tiers tried in order, e.g. a plain download and then a browser for pages built by javascript
+        self.backends = [get_scraper_backend(name.strip(), self.cfg) for name in self.cfg.scraper.split(",")
+                         if name.strip()]
+        self.static_backend = StaticBackend(self.cfg)
+
+    async def run(self):
         """
         Extracts the content from the links
         """
-        partial_extract = partial(self.extract_data_from_link, session=self.session)
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            contents = executor.map(partial_extract, self.urls)
+        client = get_async_client(self.cfg)
+        limiter = get_scraper_limiter(self.cfg)
+        contents = await asyncio.gather(*[self.extract_data_from_link(link, client, limiter) for link in self.urls])
         res = [content for content in contents if content['raw_content'] is not None]
         return res
 
-    def extract_data_from_link(self, link, session):
+    async def extract_data_from_link(self, link, client, limiter):
         """
         Extracts the data from the link
         """
+        return await self.extract(await self.fetch(link, client, limiter))
+
+    async def fetch(self, link, client, limiter):
+        """
+        Downloads the link, the network bound half of extract_data_from_link
+        Returns:
+            dict with the 'url' and either the final 'raw_content' (cache hits, documents and failures)
+            or the downloaded 'content' that still has to be extracted
+        """
         content = ""
         try:
-            if link.endswith(".pdf"):
-                content = self.scrape_pdf_with_pymupdf(link)
-            elif "arxiv.org" in link:
-                doc_num = link.split("/")[-1]
-                content = self.scrape_pdf_with_arxiv(doc_num)
-            elif link:
-                content = self.scrape_text_with_bs(link, session)
-
-            if len(content) < 100:
-                return {'url': link, 'raw_content': None}
-            return {'url': link, 'raw_content': content}
+            cached = await self.cache.get(link) if self.cache else None
+            if cached and not cached.is_stale():
+                return {'url': link, 'raw_content': cached.raw_content}
+
+            arxiv_id = parse_arxiv_id(link)
+            if arxiv_id:
+                # Takes a slot of the limiter only for the pdf, so the metadata lookups can batch
+                return await self.fetch_arxiv(link, arxiv_id, client, limiter)
+            async with limiter.limit(link):
+                if link:
+                    headers = self.headers
+                    if cached:
+                        # Revalidate the stale copy instead of downloading the page again
+                        headers = {**headers, **cached.validation_headers()}
+                    # Domains known to need a higher tier go straight to it
+                    tier = min(get_domain_tier(link), len(self.backends) - 1)
+                    fetched = await self.backends[tier].fetch(link, client, headers)
+                    if not fetched['kind'] and tier > 0:
+                        # e.g. the browser is unavailable
+                        tier = 0
+                        fetched = await self.backends[tier].fetch(link, client, headers)
+                    if cached and fetched['status_code'] == 304:
+                        await self.cache.refresh(link, fetched['headers'])
+                        content = cached.raw_content
+                    elif fetched['kind']:
+                        return {**fetched, 'tier': tier}
+
+            return self.get_result(link, content)
         except Exception as e:
             return {'url': link, 'raw_content': None}
 
-    def scrape_text_with_bs(self, link, session):
-        response = session.get(link, timeout=4)
-        soup = BeautifulSoup(response.content, 'lxml', from_encoding=response.encoding)
-
-        for script_or_style in soup(["script", "style"]):
-            script_or_style.extract()
+    async def extract(self, fetched):
+        """
+        Extracts the text of a downloaded page, the CPU bound half of extract_data_from_link
+        Args:
+            fetched: the result of fetch
 
-        raw_content = self.get_content_from_url(soup)
-        lines = (line.strip() for line in raw_content.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        content = "\n".join(chunk for chunk in chunks if chunk)
-        return content
+        Returns:
+            dict with 'url' and 'raw_content', None if nothing useful was found
+        """
+        if 'path' in fetched:
+            return await self.extract_pdf(fetched)
+        if 'content' not in fetched:
+            return fetched
+        link = fetched['url']
+        try:
+            if fetched['kind'] == "text":
+                content = clean_text(fetched['content'].decode(fetched['encoding'] or "utf-8", errors="replace"))
+            else:
+                content = await self.extract_html(fetched)
+                tier = fetched.get('tier', len(self.backends) - 1)
+                if tier + 1 < len(self.backends) and self.needs_next_tier(fetched, content):
+                    fetched, content = await self.try_next_tiers(fetched, content, tier)
+            await self.cache_content(link, content, fetched['headers'])
+            return self.get_result(link, content)
+        except Exception as e:
+            return {'url': link, 'raw_content': None}
 
-    def scrape_pdf_with_pymupdf(self, url) -> str:
-        """Scrape a pdf with pymupdf
+    async def extract_html(self, fetched):
+        # Parsing is CPU bound, the raw bytes go to the process pool so it scales across cores
+        return await run_in_process(extract_text, fetched['content'], fetched['encoding'], cfg=self.cfg,
+                                    remove_boilerplate=self.cfg.scraper_remove_boilerplate)
 
-        Args:
-            url (str): The url of the pdf to scrape
+    def needs_next_tier(self, fetched, content):
+        """
+        Whether a page is worth fetching again with the next tier: too little text was found,
+        or the page is the empty shell of an app rendered by javascript
+        """
+        return len(content) < self.cfg.scraper_render_min_chars or looks_like_js_shell(fetched['content'])
 
+    async def try_next_tiers(self, fetched, content, tier):
+        """
+        Fetches the page with the next tiers until one finds enough text
         Returns:
-            str: The text scraped from the pdf
+            (fetched, content) of the tier that found the most text
         """
-        loader = PyMuPDFLoader(url)
-        doc = loader.load()
-        return str(doc)
+        link = fetched['url']
+        client = get_async_client(self.cfg)
+        for next_tier in range(tier + 1, len(self.backends)):
+            next_fetched = await self.backends[next_tier].fetch(link, client, self.headers)
+            if next_fetched['kind'] != "html":
+                continue
+            next_content = await self.extract_html(next_fetched)
+            if len(next_content) > max(len(content), self.cfg.scraper_render_min_chars):
+                remember_domain_tier(link, next_tier)
+                return next_fetched, next_content
+        return fetched, content
+
+    @staticmethod
+    def get_result(link, content):
+        if len(content) < 100:
+            return {'url': link, 'raw_content': None}
+        return {'url': link, 'raw_content': content}
 
-    def scrape_pdf_with_arxiv(self, query) -> str:
-        """Scrape a pdf with arxiv
-        default document length of 70000 about ~15 pages or None for no limit
+    async def cache_content(self, link, content, headers=None):
+        """
+        Stores the extracted content in the scrape cache, if enabled
+        """
+        if self.cache and len(content) >= 100:
+            await self.cache.set(link, content, headers)
 
+    async def extract_pdf(self, fetched):
+        """
+        Extracts the text of a spooled pdf, several ranges of pages at a time in the process pool
         Args:
-            query (str): The query to search for
+            fetched: the result of fetch for a pdf
 
         Returns:
-            str: The text scraped from the pdf
+            dict with 'url' and 'raw_content', None if nothing useful was found
         """
-        retriever = ArxivRetriever(load_max_docs=2, doc_content_chars_max=None)
-        docs = retriever.get_relevant_documents(query=query)
-        return docs[0].page_content
-
-    def get_content_from_url(self, soup):
-        """Get the text from the soup
+        link, path = fetched['url'], fetched['path']
+        try:
+            page_count = await run_in_process(get_page_count, path, cfg=self.cfg)
+            page_ranges = get_page_ranges(page_count, self.cfg.scraper_pdf_max_pages)
+            max_chars = self.cfg.scraper_pdf_max_chars
+            pages = await asyncio.gather(*[run_in_process(extract_pages, path, start, stop, max_chars, cfg=self.cfg)
+                                           for start, stop in page_ranges])
+            content = "\n".join(page for page in pages if page)[:max_chars]
+            await self.cache_content(link, content, fetched['headers'])
+            arxiv_cache = get_arxiv_cache(self.cfg) if 'arxiv_key' in fetched else None
+            if arxiv_cache and len(content) >= 100:
+                await asyncio.to_thread(arxiv_cache.set, fetched['arxiv_key'], content.encode("utf-8"))
+            return self.get_result(link, content)
+        except Exception as e:
+            return {'url': link, 'raw_content': None}
+        finally:
+            self.discard(fetched)
 
+    @staticmethod
+    def discard(fetched):
+        """
+        Deletes the temporary file of a fetched pdf, for pages dropped before or during extraction
+        """
+        path = fetched.get('path') if fetched else None
+        if path:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def fetch_arxiv(self, link, arxiv_id, client, limiter):
+        """
+        Fetches an arXiv paper by its id. Papers without a version in the url are resolved to their
+        latest version with a batched metadata query, then the text is taken from the cache or the pdf.
         Args:
-            soup (BeautifulSoup): The soup to get the text from
+            link: the url of the paper
+            arxiv_id: (id, version) parsed from the url
+            client: httpx.AsyncClient
+            limiter: ConcurrencyLimiter of the pdf download
 
         Returns:
-            str: The text from the soup
+            the result of fetch
         """
-        text = ""
-        tags = ['p', 'h1', 'h2', 'h3', 'h4', 'h5']
-        for element in soup.find_all(tags):  # Find all the <p> elements
-            text += element.text + "\n"
-        return text
\ No newline at end of file
+        paper_id, version = arxiv_id
+        paper = None
+        if not version:
+            paper = await get_arxiv_batcher(client, self.cfg).get(paper_id)
+            if paper is None:
+                return {'url': link, 'raw_content': None}
+            version = paper['version']
+        key = f"{paper_id}{version}"
+
+        arxiv_cache = get_arxiv_cache(self.cfg)
+        if arxiv_cache:
+            entry = await asyncio.to_thread(arxiv_cache.get, key)
+            if entry:
+                return self.get_result(link, entry[0].decode("utf-8"))
+
+        pdf_url = ARXIV_PDF_URL.format(key)
+        async with limiter.limit(pdf_url):
+            fetched = await self.static_backend.fetch(pdf_url, client, self.headers)
+        if fetched['kind'] == "pdf":
+            return {**fetched, 'url': link, 'arxiv_key': key}
+        # Without the pdf, the abstract is better than nothing
+        abstract = f"{paper['title']}\n{paper['summary']}" if paper else ""
+        return self.get_result(link, abstract)
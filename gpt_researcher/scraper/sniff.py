@@ -0,0 +1,109 @@
+import re
+
+# Number of leading bytes looked at to recognize the content
+SNIFF_BYTES = 1024
+
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+TEXT_TYPES = ("text/plain", "text/markdown", "text/x-markdown")
+PDF_TYPES = ("application/pdf", "application/x-pdf")
+# Types that may hold anything, the body decides
+GENERIC_TYPES = ("", "application/octet-stream", "binary/octet-stream", "application/unknown")
+BINARY_PREFIXES = ("image/", "audio/", "video/", "font/", "model/")
+
+MAGIC_NUMBERS = [
+    (b"%PDF-", "pdf"),
+    (b"\x89PNG", None),
+    (b"\xff\xd8\xff", None),  # jpeg
+    (b"GIF8", None),
+    (b"RIFF", None),  # webp, wav, avi
+    (b"PK\x03\x04", None),  # zip, docx, xlsx, epub
+    (b"\x1f\x8b", None),  # gzip
+    (b"7z\xbc\xaf", None),
+    (b"Rar!", None),
+    (b"MZ", None),  # windows executable
+    (b"\x7fELF", None),
+    (b"\x00asm", None),
+    (b"ID3", None),  # mp3
+    (b"OggS", None),
+    (b"fLaC", None),
+    (b"\x1aE\xdf\xa3", None),  # webm, mkv
+    (b"wOFF", None),
+    (b"wOF2", None),
+]
+HTML_PATTERN = re.compile(rb"^\s*(<!--.*?-->\s*)*<(!doctype\s+html|html|head|body|meta|title|div|p|script)[\s>/]",
+                          re.IGNORECASE | re.DOTALL)
+# Empty mount points of client rendered apps, filled in by javascript
+JS_SHELL_PATTERN = re.compile(
+    rb"<div[^>]+id=[\"']?(root|app|__next|__nuxt|svelte)[\"']?[^>]*>\s*</div>|<app-root[^>]*>\s*</app-root>",
+    re.IGNORECASE)
+
+
+def get_media_type(content_type):
+    """
+    Gets the media type of a Content-Type header, without its parameters
+    """
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def get_declared_kind(content_type):
+    """
+    Gets what the Content-Type header announces
+
+    Args:
+        content_type (str): The Content-Type header
+
+    Returns:
+        str: "html", "text", "pdf", "unknown" when the body has to decide, or None for content the scraper can't use
+    """
+    media_type = get_media_type(content_type)
+    if media_type in HTML_TYPES:
+        return "html"
+    if media_type in TEXT_TYPES:
+        return "text"
+    if media_type in PDF_TYPES:
+        return "pdf"
+    if media_type in GENERIC_TYPES or media_type.startswith("text/"):
+        return "unknown"
+    return None
+
+
+def sniff_kind(head, declared_kind):
+    """
+    Decides what the body is from its first bytes, the magic numbers win over the Content-Type header
+
+    Args:
+        head (bytes): The first bytes of the body
+        declared_kind (str): The result of get_declared_kind
+
+    Returns:
+        str: "html", "text", "pdf", or None for content the scraper can't use
+    """
+    for magic, kind in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return kind
+    if head[4:8] == b"ftyp":  # mp4, mov, heic
+        return None
+    if declared_kind == "pdf":
+        # Some servers send an html error page as application/pdf
+        return "html" if HTML_PATTERN.match(head) else None
+    if declared_kind in ("html", "text"):
+        return declared_kind
+    if HTML_PATTERN.match(head):
+        return "html"
+    # Text has no NUL bytes, unless it's utf-16
+    if b"\x00" not in head or head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "text"
+    return None
+
+
+def looks_like_js_shell(html):
+    """
+    Whether an html page is the empty shell of an app rendered in the browser
+
+    Args:
+        html (bytes): The raw html
+
+    Returns:
+        bool
+    """
+    return isinstance(html, bytes) and bool(JS_SHELL_PATTERN.search(html))
@@ -0,0 +1,135 @@
+# Disk backed key/value cache
+
+# libraries
+import os
+import sqlite3
+import threading
+import time
+
+
+class DiskCache:
+    """
+    Persistent key/value cache stored in a SQLite database.
+    Every entry has an expiry time and the least recently used entries are evicted once the
+    stored values exceed the byte budget. SQLite handles the locking, so several server worker
+    processes can safely share the same file.
+    """
+    def __init__(self, path, max_bytes=None):
+        """
+        Initializes the cache
+        Args:
+            path: path of the SQLite database file, created if it doesn't exist
+            max_bytes: budget for the stored values, None for no limit
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                         "key TEXT PRIMARY KEY, value BLOB, size INTEGER, expires_at REAL, accessed_at REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+            # Running total of the stored bytes, kept by triggers in the transaction of every write,
+            # so checking the budget doesn't scan the table
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER)")
+            conn.execute("INSERT OR IGNORE INTO cache_meta (name, value) "
+                         "SELECT 'total_size', COALESCE(SUM(size), 0) FROM cache")
+            conn.execute("CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache BEGIN "
+                         "UPDATE cache_meta SET value = value + NEW.size WHERE name = 'total_size'; END")
+            conn.execute("CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache BEGIN "
+                         "UPDATE cache_meta SET value = value - OLD.size WHERE name = 'total_size'; END")
+            conn.execute("CREATE TRIGGER IF NOT EXISTS cache_update AFTER UPDATE OF size ON cache BEGIN "
+                         "UPDATE cache_meta SET value = value + NEW.size - OLD.size WHERE name = 'total_size'; END")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, include_expired=False):
+        """
+        Gets an entry
+        Args:
+            key: the key to look up
+            include_expired: also return entries past their expiry time
+
+        Returns:
+            (value, expires_at) or None if the key is missing or expired
+        """
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if not include_expired and expires_at is not None and expires_at <= now:
+                return None
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return value, expires_at
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores an entry and evicts old entries if the cache grew over its budget
+        Args:
+            key: the key to store
+            value: bytes or str
+            ttl: seconds until the entry expires, None to never expire
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._connection() as conn:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete doesn't fire the delete trigger
+            conn.execute("INSERT INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?) "
+                         "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                         "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                         (key, value, len(value), expires_at, now))
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def set_expiry(self, key, ttl=None):
+        """
+        Updates the expiry time of an entry, e.g. after a successful revalidation
+        Args:
+            key: the key to update
+            ttl: seconds until the entry expires, None to never expire
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._connection() as conn:
+            conn.execute("UPDATE cache SET expires_at = ?, accessed_at = ? WHERE key = ?", (expires_at, now, key))
+
+    def delete(self, key):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def evict(self, max_bytes):
+        """
+        Deletes the least recently used entries until the stored values fit in max_bytes
+        Args:
+            max_bytes: the byte budget
+        """
+        with self._connection() as conn:
+            total = conn.execute("SELECT value FROM cache_meta WHERE name = 'total_size'").fetchone()[0]
+            excess = total - max_bytes
+            if excess <= 0:
+                return
+            keys = []
+            for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM cache WHERE key = ?", keys)
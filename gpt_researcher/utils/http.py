@@ -0,0 +1,104 @@
+# Shared async HTTP client and connection limits
+
+# libraries
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import httpx
+
+from gpt_researcher.config import Config
+
+# httpx clients and asyncio semaphores are bound to the event loop they are first used on,
+# so one instance is kept per running loop and dropped together with the loop.
+_clients = weakref.WeakKeyDictionary()
+_limiters = weakref.WeakKeyDictionary()
+
+
+def get_async_client(cfg=None) -> httpx.AsyncClient:
+    """
+    Gets the process-wide async HTTP client.
+    The client keeps pooled keep-alive connections and is shared by every research session.
+    Args:
+        cfg: Config used to size the pool the first time the client is created
+
+    Returns:
+        httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        cfg = cfg or Config()
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=cfg.http_max_connections,
+                                max_keepalive_connections=cfg.http_max_keepalive_connections),
+            timeout=httpx.Timeout(cfg.http_timeout),
+            headers={"User-Agent": cfg.user_agent},
+            follow_redirects=True,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """
+    Closes the HTTP client of the running event loop, if there is one.
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class ConcurrencyLimiter:
+    """
+    Limits the number of concurrent requests, both overall and per host.
+    """
+    def __init__(self, max_concurrency, max_per_host):
+        """
+        Args:
+            max_concurrency: maximum number of requests in flight
+            max_per_host: maximum number of requests in flight to a single host
+        """
+        self.max_per_host = max_per_host
+        self._global = asyncio.Semaphore(max_concurrency)
+        # Only hosts with requests in flight hold a reference to their semaphore
+        self._hosts = weakref.WeakValueDictionary()
+
+    def _host_semaphore(self, url):
+        host = urlparse(url).netloc.lower()
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            self._hosts[host] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def limit(self, url):
+        """
+        Waits for a free slot for the given url
+        Args:
+            url: the url about to be requested
+        """
+        host_semaphore = self._host_semaphore(url)
+        async with host_semaphore:
+            async with self._global:
+                yield
+
+
+def get_scraper_limiter(cfg=None) -> ConcurrencyLimiter:
+    """
+    Gets the process-wide scraper concurrency limiter.
+    Args:
+        cfg: Config used to set the limits the first time the limiter is created
+
+    Returns:
+        ConcurrencyLimiter
+    """
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        cfg = cfg or Config()
+        limiter = ConcurrencyLimiter(cfg.scraper_max_concurrency, cfg.scraper_max_per_host)
+        _limiters[loop] = limiter
+    return limiter
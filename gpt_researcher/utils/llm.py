@@ -1,12 +1,23 @@
 # libraries
 from __future__ import annotations
+import asyncio
+import importlib
 import json
+import logging
+import random
+import weakref
+import httpx
+import openai
 from fastapi import WebSocket
 from langchain.adapters import openai as lc_openai
 from colorama import Fore, Style
 from typing import Optional
 
+from gpt_researcher.config import Config
 from gpt_researcher.master.prompts import auto_agent_instructions
+from gpt_researcher.utils.llm_cache import get_llm_cache
+from gpt_researcher.utils.rate_limiter import RateLimiter
+from gpt_researcher.utils.tokens import count_message_tokens
 
 
 async def create_chat_completion(
@@ -17,8 +28,11 @@ async def create_chat_completion(
         llm_provider: Optional[str] = None,
         stream: Optional[bool] = False,
         websocket: WebSocket | None = None,
+        cfg: Config | None = None,
 ) -> str:
     """Create a chat completion using the OpenAI API
+    Calls are queued by the rate limiter of the model and retried with backoff on rate limit and transient errors.
+    Non-streaming calls at temperature 0 are served from the LLM cache when it is enabled in the config.
     Args:
         messages (list[dict[str, str]]): The messages to send to the chat completion
         model (str, optional): The model to use. Defaults to None.
@@ -27,6 +41,7 @@ async def create_chat_completion(
         stream (bool, optional): Whether to stream the response. Defaults to False.
         llm_provider (str, optional): The LLM Provider to use.
         webocket (WebSocket): The websocket used in the currect request
+        cfg (Config, optional): The config with the rate limits, retries and cache. Defaults to the environment config.
     Returns:
         str: The response from the chat completion
     """
@@ -37,32 +52,145 @@ async def create_chat_completion(
     if max_tokens is not None and max_tokens > 8001:
         raise ValueError(f"Max tokens cannot be more than 8001, but got {max_tokens}")
 
+    cfg = cfg or Config()
+    llm_cache = get_llm_cache(cfg)
+    if llm_cache and temperature == 0 and not stream:
+        key = llm_cache.get_key(llm_provider, model, max_tokens, messages)
+        return await llm_cache.get_or_create(key, lambda: send_chat_completion_request_with_retries(
+            messages, model, temperature, max_tokens, stream, llm_provider, websocket, cfg
+        ))
+    return await send_chat_completion_request_with_retries(
+        messages, model, temperature, max_tokens, stream, llm_provider, websocket, cfg
+    )
+
+
+async def send_chat_completion_request_with_retries(
+        messages, model, temperature, max_tokens, stream, llm_provider, websocket, cfg
+):
+    rate_limiter = get_llm_rate_limiter(model, cfg)
+    # The completion tokens count against the budget too
+    tokens = count_message_tokens(messages, model) + (max_tokens or 0)
+
     # create response
-    for attempt in range(10):  # maximum of 10 attempts
-        response = await send_chat_completion_request(
-            messages, model, temperature, max_tokens, stream, llm_provider, websocket
+    for attempt in range(cfg.llm_max_retries + 1):
+        await rate_limiter.acquire(tokens)
+        try:
+            return await send_chat_completion_request(
+                messages, model, temperature, max_tokens, stream, llm_provider, websocket
+            )
+        except Exception as e:
+            if not is_retryable_error(e):
+                raise
+            if attempt == cfg.llm_max_retries:
+                logging.error("Failed to get response from OpenAI API")
+                raise RuntimeError("Failed to get response from OpenAI API") from e
+            delay = get_retry_delay(e, attempt, cfg)
+            if is_rate_limit_error(e):
+                # Hold back every other call to this model too
+                rate_limiter.pause(delay)
+            logging.warning(f"LLM request failed ({e}), retrying in {delay:.1f}s "
+                            f"({attempt + 1}/{cfg.llm_max_retries})")
+            await asyncio.sleep(delay)
+
+
+# One rate limiter per model, shared by every research session of the process
+_llm_rate_limiters = {}
+
+
+def get_llm_rate_limiter(model, cfg):
+    """Gets the process-wide rate limiter of a model
+    Args:
+        model (str): The model
+        cfg (Config): The config with the default and per-model budgets, used on first use of the model
+    Returns:
+        RateLimiter: The rate limiter
+    """
+    if model not in _llm_rate_limiters:
+        limits = (cfg.llm_rate_limits or {}).get(model, {})
+        _llm_rate_limiters[model] = RateLimiter(
+            requests_per_minute=limits.get("requests_per_minute", cfg.llm_requests_per_minute),
+            tokens_per_minute=limits.get("tokens_per_minute", cfg.llm_tokens_per_minute),
         )
-        return response
+    return _llm_rate_limiters[model]
 
-    logging.error("Failed to get response from OpenAI API")
-    raise RuntimeError("Failed to get response from OpenAI API")
 
+def _get_status_code(error):
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code
 
-import logging
+
+def is_rate_limit_error(error) -> bool:
+    return isinstance(error, openai.RateLimitError) or _get_status_code(error) == 429
+
+
+def is_retryable_error(error) -> bool:
+    """Checks if a failed LLM request is worth retrying: rate limits, timeouts, connection and server errors
+    Args:
+        error (Exception): The error raised by the request
+    Returns:
+        bool: Whether to retry
+    """
+    if isinstance(error, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError,
+                          openai.InternalServerError, httpx.TransportError, asyncio.TimeoutError,
+                          ConnectionError)):
+        return True
+    status_code = _get_status_code(error)
+    return isinstance(status_code, int) and (status_code in (408, 409, 429) or status_code >= 500)
+
+
+def get_retry_delay(error, attempt, cfg) -> float:
+    """Gets the delay before the next attempt: the server's Retry-After if given,
+    otherwise exponential backoff with full jitter
+    Args:
+        error (Exception): The error raised by the request
+        attempt (int): The number of the failed attempt, starting at 0
+        cfg (Config): The config with the backoff settings
+    Returns:
+        float: The delay in seconds
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return min(float(headers.get("retry-after")), cfg.llm_retry_max_delay)
+    except (TypeError, ValueError):
+        return random.uniform(0, min(cfg.llm_retry_max_delay, cfg.llm_retry_base_delay * 2 ** attempt))
+
+
+# Chat models are cached per event loop so their async HTTP clients, and the
+# pooled connections they hold, are reused across calls and research sessions.
+_chat_models = weakref.WeakKeyDictionary()
+
+
+def get_chat_model(llm_provider, model, temperature, max_tokens):
+    """Gets a LangChain chat model, reusing the instance of earlier calls with the same settings
+    Args:
+        llm_provider (str): The LangChain chat model class, e.g. ChatOpenAI
+        model (str): The model to use
+        temperature (float): The temperature to use
+        max_tokens (int): The max tokens to use
+    Returns:
+        BaseChatModel: The chat model
+    """
+    models = _chat_models.setdefault(asyncio.get_running_loop(), {})
+    key = (llm_provider, model, temperature, max_tokens)
+    if key not in models:
+        model_cls = getattr(importlib.import_module("langchain.chat_models"), llm_provider)
+        kwargs = {}
+        if "max_retries" in getattr(model_cls, "__fields__", {}):
+            # Retries are handled by create_chat_completion, which also respects the rate limiter
+            kwargs["max_retries"] = 0
+        models[key] = model_cls(model=model, temperature=temperature, max_tokens=max_tokens, **kwargs)
+    return models[key]
 
 
 async def send_chat_completion_request(
         messages, model, temperature, max_tokens, stream, llm_provider, websocket
 ):
     if not stream:
-        result = lc_openai.ChatCompletion.create(
-            model=model,  # Change model here to use different models
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            provider=llm_provider,  # Change provider here to use a different API
-        )
-        return result["choices"][0]["message"]["content"]
+        chat_model = get_chat_model(llm_provider, model, temperature, max_tokens)
+        result = await chat_model.ainvoke(lc_openai.convert_openai_messages(messages))
+        return result.content
     else:
         return await stream_response(model, messages, temperature, max_tokens, llm_provider, websocket)
 
@@ -71,24 +199,24 @@ async def stream_response(model, messages, temperature, max_tokens, llm_provider
     paragraph = ""
     response = ""
 
-    for chunk in lc_openai.ChatCompletion.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            provider=llm_provider,
-            stream=True,
-    ):
-        content = chunk["choices"][0].get("delta", {}).get("content")
-        if content is not None:
-            response += content
-            paragraph += content
-            if "\n" in paragraph:
-                if websocket is not None:
-                    await websocket.send_json({"type": "report", "output": paragraph})
-                else:
-                    print(f"{Fore.GREEN}{paragraph}{Style.RESET_ALL}")
-                paragraph = ""
+    chat_model = get_chat_model(llm_provider, model, temperature, max_tokens)
+    try:
+        async for chunk in chat_model.astream(lc_openai.convert_openai_messages(messages)):
+            content = chunk.content
+            if content:
+                response += content
+                paragraph += content
+                if "\n" in paragraph:
+                    if websocket is not None:
+                        await websocket.send_json({"type": "report", "output": paragraph})
+                    else:
+                        print(f"{Fore.GREEN}{paragraph}{Style.RESET_ALL}")
+                    paragraph = ""
+    except Exception as e:
+        if response:
+            # Part of the answer was already streamed, a retry would send it twice
+            raise RuntimeError(f"LLM stream interrupted: {e}") from e
+        raise
     return response
 
 
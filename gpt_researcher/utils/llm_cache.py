@@ -0,0 +1,85 @@
+# Cache of deterministic LLM responses
+
+# libraries
+import asyncio
+import hashlib
+import json
+import os
+
+from gpt_researcher.utils.cache import DiskCache
+
+_llm_caches = {}
+
+
+class LLMCache:
+    """
+    Disk backed cache of chat completions, meant for temperature 0 calls with fully determined prompts.
+    Concurrent identical requests are collapsed into a single call.
+    """
+    def __init__(self, path, ttl, max_bytes=None):
+        """
+        Args:
+            path: path of the cache database
+            ttl: seconds a response stays valid
+            max_bytes: byte budget of the cache
+        """
+        self.ttl = ttl
+        self.store = DiskCache(path, max_bytes=max_bytes)
+        self._inflight = {}
+
+    @staticmethod
+    def get_key(llm_provider, model, max_tokens, messages):
+        """
+        Gets the cache key of a request
+        Returns:
+            str: hash of the provider, model, max tokens and messages
+        """
+        payload = json.dumps([llm_provider, model, max_tokens, messages], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_or_create(self, key, create):
+        """
+        Returns the cached response for the key, or awaits create() once and caches its result
+        Args:
+            key: the cache key of the request
+            create: coroutine function making the actual LLM call
+
+        Returns:
+            str: The response
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            entry = await asyncio.to_thread(self.store.get, key)
+            if entry is not None:
+                return entry[0].decode("utf-8")
+            # Another caller may have started the same request while we were reading the cache
+            task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._create(key, create))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded, so one caller giving up doesn't cancel the call the others are waiting for
+        return await asyncio.shield(task)
+
+    async def _create(self, key, create):
+        response = await create()
+        if response:
+            await asyncio.to_thread(self.store.set, key, response.encode("utf-8"), self.ttl)
+        return response
+
+
+def get_llm_cache(cfg):
+    """
+    Gets the process-wide LLM response cache
+    Args:
+        cfg: Config
+
+    Returns:
+        LLMCache or None if the cache is disabled
+    """
+    if not cfg.llm_cache:
+        return None
+    path = os.path.join(cfg.cache_dir, "llm.db")
+    if path not in _llm_caches:
+        _llm_caches[path] = LLMCache(path, ttl=cfg.llm_cache_ttl, max_bytes=cfg.llm_cache_max_bytes)
+    return _llm_caches[path]
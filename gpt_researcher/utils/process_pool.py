@@ -0,0 +1,79 @@
+# Process pool for CPU bound work
+
+# libraries
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from colorama import Fore, Style
+
+from gpt_researcher.config import Config
+
+_executor = None
+
+
+def get_process_pool(cfg=None):
+    """
+    Gets the process-wide pool used for CPU bound work such as html parsing.
+    The pool is created on first use and shared by every research session.
+    It is disabled unless SCRAPER_PARSE_WORKERS is set: the forkserver and spawn workers import the
+    main module of the program again, so a script that enables it must guard its entry point with
+    `if __name__ == "__main__":`, otherwise every worker starts the script over.
+    Args:
+        cfg: Config used to size the pool the first time it is created
+
+    Returns:
+        ProcessPoolExecutor or None if the pool is disabled
+    """
+    global _executor
+    if _executor is None:
+        cfg = cfg or Config()
+        if cfg.scraper_parse_workers <= 0:
+            return None
+        # Forking a process that runs an event loop and other threads isn't safe
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            # Workers are forked from a server that already imported the parser
+            context.set_forkserver_preload(["gpt_researcher.scraper.extractor"])
+        else:
+            context = multiprocessing.get_context("spawn")
+        _executor = ProcessPoolExecutor(max_workers=cfg.scraper_parse_workers, mp_context=context)
+    return _executor
+
+
+def shutdown_process_pool():
+    """
+    Shuts down the process pool, if it was started
+    """
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_in_process(func, *args, cfg=None, **kwargs):
+    """
+    Runs a CPU bound function in the process pool, so it doesn't hold the GIL of the event loop.
+    Falls back to a thread if the pool is disabled or a worker died.
+    Args:
+        func: module level function, it and its arguments must be picklable
+        *args: arguments of the function
+        cfg: Config
+        **kwargs: keyword arguments of the function
+
+    Returns:
+        the result of the function
+    """
+    global _executor
+    executor = get_process_pool(cfg)
+    if executor is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args, **kwargs))
+        except BrokenProcessPool as e:
+            print(f"{Fore.RED}Process pool is broken, restarting it: {e}{Style.RESET_ALL}")
+            if _executor is executor:
+                _executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+    return await asyncio.to_thread(func, *args, **kwargs)
@@ -0,0 +1,83 @@
+# Request and token rate limiting
+
+# libraries
+import asyncio
+import time
+
+
+class _Bucket:
+    """
+    Token bucket refilled continuously at a per-minute rate
+    """
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.available = per_minute
+        self.updated_at = time.monotonic()
+
+    def refill(self, now):
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount):
+        # A request larger than the whole budget only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.available) / self.rate)
+
+    def consume(self, amount):
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Limits requests per minute and tokens per minute.
+    Callers wait in line until the budget allows their request, instead of failing.
+    """
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        """
+        Args:
+            requests_per_minute: request budget, None or 0 for no limit
+            tokens_per_minute: token budget, None or 0 for no limit
+        """
+        self.requests = _Bucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = _Bucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._loop = None
+        self._lock = None
+
+    def _get_lock(self):
+        # asyncio.Lock is bound to the event loop it is first used on
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def pause(self, seconds):
+        """
+        Holds back every caller for the given time, e.g. after the provider answered 429
+        Args:
+            seconds: how long to pause
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, tokens=0):
+        """
+        Waits until a request of the given number of tokens fits in the budget, then takes it
+        Args:
+            tokens: estimated number of tokens of the request
+        """
+        buckets = [(bucket, amount) for bucket, amount in ((self.requests, 1), (self.tokens, tokens)) if bucket]
+        if not buckets and self._paused_until <= time.monotonic():
+            return
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                for bucket, _ in buckets:
+                    bucket.refill(now)
+                wait = max([self._paused_until - now] + [bucket.wait_time(amount) for bucket, amount in buckets])
+                if wait <= 0:
+                    for bucket, amount in buckets:
+                        bucket.consume(amount)
+                    return
+                await asyncio.sleep(wait)
@@ -0,0 +1,208 @@
+# Token counting
+
+# libraries
+import functools
+import logging
+import re
+from typing import Iterator, List
+
+# Encoding of the current OpenAI chat and embedding models
+DEFAULT_ENCODING = "cl100k_base"
+# Rough length of a token of english text, used when no tokenizer can be loaded
+CHARS_PER_TOKEN = 4
+
+LINE_PATTERN = re.compile(r"[^\n]+\n*|\n+")
+
+# Context window of the models in tokens, looked up by the longest matching prefix of the model name
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 4096,
+    "gpt-3.5-turbo-16k": 16385,
+    "gpt-3.5-turbo-1106": 16385,
+    "gpt-3.5-turbo-0125": 16385,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-1106": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-vision": 128000,
+    "gpt-4o": 128000,
+    "claude-2": 100000,
+    "claude-3": 200000,
+    "gemini-pro": 30720,
+    "mistral": 32000,
+    "mixtral": 32000,
+}
+DEFAULT_CONTEXT_WINDOW = 4096
+# Share of the context window left after the completion that a prompt fills, the rest is room for counting errors
+DEFAULT_CONTEXT_WINDOW_SHARE = 0.75
+# Tokens added by the chat format to every message
+TOKENS_PER_MESSAGE = 4
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoding(model: str = None):
+    """
+    Gets the tiktoken encoding of a model. Encodings are loaded once per process,
+    models tiktoken doesn't know, e.g. of other providers, use the default encoding.
+    Args:
+        model: the model, None for the default encoding
+
+    Returns:
+        tiktoken.Encoding or None if tiktoken or its encoding files are unavailable
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        if model:
+            return tiktoken.encoding_for_model(model)
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except KeyError:
+        return get_encoding(None)
+    except Exception as e:
+        # The encoding files are downloaded on first use, which fails offline
+        logging.warning(f"Can't load the tokenizer of {model or DEFAULT_ENCODING}, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    """
+    Counts the tokens of a text
+    Args:
+        text: the text
+        model: the model the text is sent to
+
+    Returns:
+        int: the number of tokens, estimated from the length if there is no tokenizer
+    """
+    if not text:
+        return 0
+    encoding = get_encoding(model)
+    if encoding is None:
+        # Rounded up, so a slice of max_tokens * CHARS_PER_TOKEN characters counts as max_tokens
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_by_tokens(text: str, max_tokens: int, model: str = None) -> Iterator[str]:
+    """
+    Splits a text in chunks of at most max_tokens tokens, cut at line breaks where possible.
+    The chunks are produced while the text is read, the text is never split in words.
+    Args:
+        text: the text
+        max_tokens: the maximum tokens of a chunk
+        model: the model the chunks are sent to
+
+    Yields:
+        str: the chunks, in order
+    """
+    chunk = []
+    chunk_tokens = 0
+    for match in LINE_PATTERN.finditer(text or ""):
+        line = match.group()
+        tokens = count_tokens(line, model)
+        if chunk and chunk_tokens + tokens > max_tokens:
+            yield "".join(chunk)
+            chunk = []
+            chunk_tokens = 0
+        if tokens > max_tokens:
+            yield from _split_line(line, max_tokens, model)
+            continue
+        chunk.append(line)
+        chunk_tokens += tokens
+    if chunk:
+        yield "".join(chunk)
+
+
+def _split_line(line, max_tokens, model):
+    encoding = get_encoding(model)
+    if encoding is None:
+        size = max_tokens * CHARS_PER_TOKEN
+        for start in range(0, len(line), size):
+            yield line[start:start + size]
+        return
+    tokens = encoding.encode(line, disallowed_special=())
+    for start in range(0, len(tokens), max_tokens):
+        yield encoding.decode(tokens[start:start + max_tokens])
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = None) -> str:
+    """
+    Cuts a text down to its first max_tokens tokens
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    return next(_split_line(text, max_tokens, model), "")
+
+
+def count_message_tokens(messages: List[dict], model: str = None) -> int:
+    """
+    Counts the tokens of chat messages, with the tokens the chat format adds
+    """
+    return sum(count_tokens(str(message.get("content", "")), model) + TOKENS_PER_MESSAGE
+               for message in messages)
+
+
+def get_context_window(model: str, context_windows: dict = None) -> int:
+    """
+    Gets the context window of a model
+    Args:
+        model: the model
+        context_windows: windows of models missing from MODEL_CONTEXT_WINDOWS or with a different window,
+            looked up first
+
+    Returns:
+        int: the context window in tokens, DEFAULT_CONTEXT_WINDOW for unknown models
+    """
+    for windows in (context_windows or {}, MODEL_CONTEXT_WINDOWS):
+        prefixes = [prefix for prefix in windows if (model or "").startswith(prefix)]
+        if prefixes:
+            return int(windows[max(prefixes, key=len)])
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def get_token_budget(model: str, share: float = DEFAULT_CONTEXT_WINDOW_SHARE, reserved: int = 0,
+                     completion_tokens: int = 0, context_windows: dict = None) -> int:
+    """
+    Gets the number of tokens of text a prompt to a model can hold.
+    The completion is taken off the window first, the prompt fills a share of what is left.
+    Args:
+        model: the model
+        share: share of the window left after the completion that the prompt fills
+        reserved: tokens of the prompt already taken, e.g. by its instructions
+        completion_tokens: maximum tokens of the completion
+        context_windows: windows that override MODEL_CONTEXT_WINDOWS
+
+    Returns:
+        int: the budget in tokens, at least a tenth of the prompt's share
+    """
+    target = int(max(get_context_window(model, context_windows) - completion_tokens, 0) * share)
+    return max(target - reserved, target // 10)
+
+
+def pack_by_tokens(texts: List[str], max_tokens: int, model: str = None) -> List[str]:
+    """
+    Fits texts in a number of tokens. If they don't fit, the longest ones are cut down so that
+    every text keeps an equal share of the budget, shorter texts leave their unused share to the others.
+    Args:
+        texts: the texts
+        max_tokens: the total number of tokens
+        model: the model the texts are sent to
+
+    Returns:
+        list: the texts, cut down where needed, in order
+    """
+    counts = [count_tokens(text, model) for text in texts]
+    if sum(counts) <= max_tokens:
+        return list(texts)
+    limits = list(counts)
+    remaining = max_tokens
+    order = sorted(range(len(texts)), key=lambda i: counts[i])
+    for position, i in enumerate(order):
+        limits[i] = min(counts[i], remaining // (len(order) - position))
+        remaining -= limits[i]
+    return [text if limits[i] == counts[i] else truncate_tokens(text, limits[i], model)
+            for i, text in enumerate(texts)]
@@ -0,0 +1,48 @@
+# URL helpers
+
+# libraries
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track the visitor and never change the page. Generic names such as
+# "ref" are left out, some sites select the content with them
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gclsrc", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "spm", "cmpid", "ncid", "sr_share", "s_cid",
+}
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(("utm_", "pk_", "mtm_"))
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a url so that variants of the same address compare equal.
+    http and https, upper and lower case host, "www.", default port, fragment, trailing slash,
+    tracking parameters and query parameter order make no difference.
+    The result is meant as a key for deduplication, not as an address to fetch.
+    Args:
+        url: the url to normalize
+
+    Returns:
+        str: the normalized url
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+        port = None if port == 80 else port
+    host = (parts.hostname or "").removeprefix("www.")
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    params = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if not is_tracking_param(name))
+    return urlunsplit((scheme, host, path, urlencode(params), ""))
@@ -1,50 +1,42 @@
 """Text processing functions"""
+import asyncio
 import urllib
-from typing import Dict, Generator, Optional
+from typing import Dict, Generator, List, Optional
 
 from selenium.webdriver.remote.webdriver import WebDriver
 
-from config import Config
-from gpt_researcher_old.retriever.llm_utils import create_chat_completion
+from gpt_researcher.utils.llm import create_chat_completion
+from gpt_researcher.utils.tokens import (DEFAULT_CONTEXT_WINDOW_SHARE, count_message_tokens, count_tokens,
+                                         get_token_budget, split_by_tokens)
 import os
 from md2pdf.core import md2pdf
 
 
-def split_text(text: str, max_length: int = 8192) -> Generator[str, None, None]:
-    """Split text into chunks of a maximum length
+def split_text(text: str, max_tokens: int = 2000, model: Optional[str] = None) -> Generator[str, None, None]:
+    """Split text into chunks of a maximum number of tokens, at line breaks where possible
 
     Args:
         text (str): The text to split
-        max_length (int, optional): The maximum length of each chunk. Defaults to 8192.
+        max_tokens (int, optional): The maximum tokens of each chunk. Defaults to 2000.
+        model (str, optional): The model the chunks are sent to, for its tokenizer
 
     Yields:
         str: The next chunk of text
-
-    Raises:
-        ValueError: If the text is longer than the maximum length
     """
-    paragraphs = text.split("\n")
-    current_length = 0
-    current_chunk = []
-
-    for paragraph in paragraphs:
-        if current_length + len(paragraph) + 1 <= max_length:
-            current_chunk.append(paragraph)
-            current_length += len(paragraph) + 1
-        else:
-            yield "\n".join(current_chunk)
-            current_chunk = [paragraph]
-            current_length = len(paragraph) + 1
-
-    if current_chunk:
-        yield "\n".join(current_chunk)
+    yield from split_by_tokens(text, max_tokens, model)
 
 
-def summarize_text(
-    fast_llm_model: str, summary_token_limit: int, llm_provider: str, url: str, text: str, question: str, driver: Optional[WebDriver] = None
+async def summarize_text(
+    fast_llm_model: str, summary_token_limit: int, llm_provider: str, url: str, text: str, question: str, driver: Optional[WebDriver] = None,
+    max_concurrency: int = 8, reduce_token_limit: Optional[int] = None,
+    context_window_share: float = DEFAULT_CONTEXT_WINDOW_SHARE, context_windows: Optional[dict] = None
 ) -> str:
     """Summarize text using the OpenAI API
 
+    The chunks of the text are summarized concurrently, then the summaries are combined in rounds:
+    every round summarizes groups of summaries that fit in reduce_token_limit tokens, until one is left.
+    A long page costs a number of rounds that grows with the log of its length.
+
     Args:
         fast_llm_model (str): The fast LLM model e.g gpt3.5-turbo-16k
         summary_token_limit (int): The summary token limit
@@ -53,6 +45,11 @@ def summarize_text(
         text (str): The text to summarize
         question (str): The question to ask the model
         driver (WebDriver): The webdriver to use to scroll the page
+        max_concurrency (int, optional): The maximum number of summaries requested at a time. Defaults to 8.
+        reduce_token_limit (int, optional): The maximum tokens of the summaries combined by one request.
+            Defaults to what fits in the context window of the model, like the chunks.
+        context_window_share (float, optional): The share of the context window the chunks fill
+        context_windows (dict, optional): Context windows of models that override the known ones
 
     Returns:
         str: The summary of the text
@@ -60,45 +57,79 @@ def summarize_text(
     if not text:
         return "Error: No text to summarize"
 
-    summaries = []
-    chunks = list(split_text(text))
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # Chunks fill the model's window, next to the instructions and the summary
+    chunk_tokens = get_token_budget(
+        fast_llm_model,
+        context_window_share,
+        reserved=count_message_tokens([create_message("", question)], fast_llm_model),
+        completion_tokens=int(summary_token_limit),
+        context_windows=context_windows
+    )
+    reduce_token_limit = reduce_token_limit or chunk_tokens
+
+    async def summarize_chunk(chunk: str, scroll_ratio: Optional[float] = None) -> str:
+        async with semaphore:
+            if driver and scroll_ratio is not None:
+                scroll_to_percentage(driver, scroll_ratio)
+            return await create_chat_completion(
+                model=fast_llm_model,
+                messages=[create_message(chunk, question)],
+                max_tokens=summary_token_limit,
+                llm_provider=llm_provider
+            )
+
+    chunks = list(split_text(text, chunk_tokens, fast_llm_model))
     scroll_ratio = 1 / len(chunks)
 
     print(f"Summarizing url: {url} with total chunks: {len(chunks)}")
-    for i, chunk in enumerate(chunks):
-        if driver:
-            scroll_to_percentage(driver, scroll_ratio * i)
+    summaries = await asyncio.gather(
+        *[summarize_chunk(chunk, scroll_ratio * i) for i, chunk in enumerate(chunks)]
+    )
 
-        #memory_to_add = f"Source: {url}\n" f"Raw content part#{i + 1}: {chunk}"
+    rounds = 0
+    while len(summaries) > 1:
+        groups = group_by_tokens(summaries, reduce_token_limit, fast_llm_model)
+        summaries = await asyncio.gather(*[summarize_chunk("\n".join(group)) for group in groups])
+        rounds += 1
 
-        #MEMORY.add_documents([Document(page_content=memory_to_add)])
+    final_summary = summaries[0]
+    print(f"Final summary of {url} after {rounds} reduce rounds, length: {len(final_summary)}")
+    print(final_summary)
 
-        messages = [create_message(chunk, question)]
+    return final_summary
 
-        summary = create_chat_completion(
-            model=fast_llm_model,
-            messages=messages,
-            max_tokens=summary_token_limit,
-            llm_provider=llm_provider
-        )
-        summaries.append(summary)
-        #memory_to_add = f"Source: {url}\n" f"Content summary part#{i + 1}: {summary}"
 
-        #MEMORY.add_documents([Document(page_content=memory_to_add)])
+def group_by_tokens(texts: List[str], max_tokens: int, model: Optional[str] = None) -> List[List[str]]:
+    """Group consecutive texts so that every group fits in a number of tokens
 
-    combined_summary = "\n".join(summaries)
-    messages = [create_message(combined_summary, question)]
+    Every group holds at least two texts, so that summarizing the groups always shrinks the list.
 
-    final_summary = create_chat_completion(
-        model=fast_llm_model,
-        messages=messages,
-        max_tokens=summary_token_limit,
-        llm_provider=llm_provider,
-    )
-    print("Final summary length: ", len(combined_summary))
-    print(final_summary)
+    Args:
+        texts (List[str]): The texts
+        max_tokens (int): The maximum tokens of a group
+        model (str, optional): The model the groups are sent to
 
-    return final_summary
+    Returns:
+        List[List[str]]: The groups, in order
+    """
+    groups = []
+    group = []
+    group_tokens = 0
+    for text in texts:
+        tokens = count_tokens(text, model) + 1
+        if len(group) >= 2 and group_tokens + tokens > max_tokens:
+            groups.append(group)
+            group = []
+            group_tokens = 0
+        group.append(text)
+        group_tokens += tokens
+
+    if len(group) == 1 and groups:
+        groups[-1].append(group[0])
+    elif group:
+        groups.append(group)
+    return groups
 
 
 def scroll_to_percentage(driver: WebDriver, ratio: float) -> None:
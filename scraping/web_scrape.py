@@ -1,30 +1,24 @@
 """Selenium web scraping module."""
 from __future__ import annotations
 
-import logging
 import asyncio
+import functools
 from pathlib import Path
-from sys import platform
 
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.safari.options import Options as SafariOptions
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 from fastapi import WebSocket
 
-from scraping import scrape_skills, processing as summary
+from scraping import scrape_skills
 from scraping.processing.html import extract_hyperlinks, format_hyperlinks
 
-from concurrent.futures import ThreadPoolExecutor
-
 from scraping.processing.text import summarize_text
-
-executor = ThreadPoolExecutor()
+from gpt_researcher.config import Config
+from gpt_researcher.scraper.browser import get_browser_executor, get_browser_pool
+from gpt_researcher.scraper.extractor import extract_text
 
 FILE_DIR = Path(__file__).parent.parent
 
@@ -50,8 +44,9 @@ async def async_browse(
     Returns:
         str: The answer and links to the user
     """
-    loop = asyncio.get_event_loop()
-    executor = ThreadPoolExecutor(max_workers=8)
+    cfg = Config()
+    loop = asyncio.get_running_loop()
+    executor = get_browser_executor(cfg)
 
     print(f"Scraping url {url} with question {question}")
     if websocket:
@@ -65,12 +60,13 @@ async def async_browse(
         print(f"🔎 Browsing the {url} for relevant about: {question}...")
 
     try:
-        driver, text = await loop.run_in_executor(
+        text = await loop.run_in_executor(
             executor, scrape_text_with_selenium, selenium_web_browser, user_agent, url
         )
-        await loop.run_in_executor(executor, add_header, driver)
-        summary_text = await loop.run_in_executor(
-            executor, summarize_text, fast_llm_model, summary_token_limit, llm_provider, url, text, question, driver
+        # The driver is back in the pool by now, the summary only needs the text
+        summary_text = await summarize_text(
+            fast_llm_model, summary_token_limit, llm_provider, url, text, question,
+            context_window_share=cfg.context_window_share, context_windows=cfg.model_context_windows
         )
         if websocket:
             await websocket.send_json(
@@ -88,7 +84,7 @@ async def async_browse(
         return f"Error processing the url {url}: {e}"
 
 
-def browse_website(url: str, question: str) -> tuple[str, WebDriver]:
+async def browse_website(url: str, question: str) -> str:
     """Browse a website and return the answer and links to the user
 
     Args:
@@ -96,17 +92,25 @@ def browse_website(url: str, question: str) -> tuple[str, WebDriver]:
         question (str): The question asked by the user
 
     Returns:
-        Tuple[str, WebDriver]: The answer and links to the user and the webdriver
+        str: The answer and links to the user
     """
 
     if not url:
-        return "A URL was not specified, cancelling request to browse website.", None
-
-    driver, text = scrape_text_with_selenium(url)
-    add_header(driver)
-    summary_text = summary.summarize_text(url, text, question, driver)
-
-    links = scrape_links_with_selenium(driver, url)
+        return "A URL was not specified, cancelling request to browse website."
+
+    cfg = Config()
+    loop = asyncio.get_running_loop()
+    executor = get_browser_executor(cfg)
+    # The text and the links come from one page load, the driver is back in the pool before summarizing
+    text, links = await loop.run_in_executor(
+        executor, functools.partial(
+            scrape_text_with_selenium, cfg.selenium_web_browser, cfg.user_agent, url, with_links=True
+        )
+    )
+    summary_text = await summarize_text(
+        cfg.fast_llm_model, cfg.summary_token_limit, cfg.llm_provider, url, text, question,
+        context_window_share=cfg.context_window_share, context_windows=cfg.model_context_windows
+    )
 
     # Limit links to 5
     if len(links) > 5:
@@ -114,56 +118,24 @@ def browse_website(url: str, question: str) -> tuple[str, WebDriver]:
 
     # write_to_file('research-{0}.txt'.format(url), summary_text + "\nSource Links: {0}\n\n".format(links))
 
-    close_browser(driver)
-    return f"Answer gathered from website: {summary_text} \n \n Links: {links}", driver
+    return f"Answer gathered from website: {summary_text} \n \n Links: {links}"
 
 
-def scrape_text_with_selenium(selenium_web_browser: str, user_agent: str, url: str) -> tuple[WebDriver, str]:
-    """Scrape text from a website using selenium
+def scrape_text_with_selenium(selenium_web_browser: str, user_agent: str, url: str,
+                              with_links: bool = False) -> str | tuple[str, list[str]]:
+    """Scrape text from a website using a pooled selenium driver
 
     Args:
         url (str): The url of the website to scrape
         selenium_web_browser (str): The web browser used to scrape
         user_agent (str): The user agent used when scraping
+        with_links (bool): Also return the links of the page, read from the same page load
 
     Returns:
-        Tuple[WebDriver, str]: The webdriver and the text scraped from the website
+        str: The text scraped from the website, with the list of links if with_links is set
     """
-    logging.getLogger("selenium").setLevel(logging.CRITICAL)
-
-    options_available = {
-        "chrome": ChromeOptions,
-        "safari": SafariOptions,
-        "firefox": FirefoxOptions,
-    }
-
-    options = options_available[selenium_web_browser]()
-    options.add_argument(f"user-agent={user_agent}")
-    options.add_argument("--headless")
-    options.add_argument("--enable-javascript")
-
-    if selenium_web_browser == "firefox":
-        driver = webdriver.Firefox(options=options)
-    elif selenium_web_browser == "safari":
-        # Requires a bit more setup on the users end
-        # See https://developer.apple.com/documentation/webkit/testing_with_webdriver_in_safari
-        driver = webdriver.Safari(options=options)
-    else:
-        if platform == "linux" or platform == "linux2":
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--remote-debugging-port=9222")
-        options.add_argument("--no-sandbox")
-        options.add_experimental_option("prefs", {"download_restrictions": 3})
-        driver = webdriver.Chrome(options=options)
-
-    print(f"scraping url {url}...")
-    driver.get(url)
-
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.TAG_NAME, "body"))
-    )
-
-    # check if url is a pdf or arxiv link
+    links = []
+    # check if url is a pdf or arxiv link, those don't need a browser
     if url.endswith(".pdf"):
         text = scrape_skills.scrape_pdf_with_pymupdf(url)
     elif "arxiv" in url:
@@ -171,36 +143,24 @@ def scrape_text_with_selenium(selenium_web_browser: str, user_agent: str, url: s
         doc_num = url.split("/")[-1]
         text = scrape_skills.scrape_pdf_with_arxiv(doc_num)
     else:
-        # Get the HTML content directly from the browser's DOM
-        page_source = driver.execute_script("return document.body.outerHTML;")
-        soup = BeautifulSoup(page_source, "html.parser")
-
-        for script in soup(["script", "style"]):
-            script.extract()
-
-        # text = soup.get_text()
-        text = get_text(soup)
+        print(f"scraping url {url}...")
+        with get_browser_pool(selenium_web_browser, user_agent).driver() as driver:
+            driver.get(url)
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+            # Get the HTML content directly from the browser's DOM
+            page_source = driver.execute_script("return document.body.outerHTML;")
+            if with_links:
+                links = scrape_links_with_selenium(driver, url)
+        # The extractor already normalizes the whitespace
+        text = extract_text(page_source)
+        return (text, links) if with_links else text
 
     lines = (line.strip() for line in text.splitlines())
     chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
     text = "\n".join(chunk for chunk in chunks if chunk)
-    return driver, text
-
-
-def get_text(soup):
-    """Get the text from the soup
-
-    Args:
-        soup (BeautifulSoup): The soup to get the text from
-
-    Returns:
-        str: The text from the soup
-    """
-    text = ""
-    tags = ["h1", "h2", "h3", "h4", "h5", "p"]
-    for element in soup.find_all(tags):  # Find all the <p> elements
-        text += element.text + "\n\n"
-    return text
+    return (text, links) if with_links else text
 
 
 def scrape_links_with_selenium(driver: WebDriver, url: str) -> list[str]:
@@ -0,0 +1,24 @@
+from gpt_researcher.config import Config
+from gpt_researcher.master.functions import get_retriever
+
+
+def test_multi_retriever_skips_backend_without_key(monkeypatch, tmp_path):
+    monkeypatch.delenv("BING_API_KEY", raising=False)
+    monkeypatch.setenv("SEARCH_CACHE", "True")
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+    cfg = Config()
+
+    retriever = get_retriever("duckduckgo,BingSearch", cfg)("test query")
+
+    assert len(retriever.retrievers) == 1
+    assert retriever.retrievers[0].name == "duckduckgo"
+
+
+def test_multi_retriever_skips_backend_without_key_uncached(monkeypatch):
+    monkeypatch.delenv("BING_API_KEY", raising=False)
+    monkeypatch.setenv("SEARCH_CACHE", "False")
+    cfg = Config()
+
+    retriever = get_retriever("duckduckgo,BingSearch", cfg)("test query")
+
+    assert len(retriever.retrievers) == 1